@@ -1,65 +1,175 @@
 import pandas as pd
 import numpy as np
-import statsmodels.api as sm
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import os
+import pickle
+import sys
+
+from results_store import (new_run_id, regression_tables, classification_tables, append_results,
+                           load_results, render_text, export_latest_run)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import load_dataset, normalize_frame, resolve_columns, BASIC_DATA_PATH, PRO_BOWL_THRESHOLD
+from common.artifacts import write_frame_json
+from common.draft import draft_features, MODEL_FEATURES as DRAFT_FEATURES
+
+# Source files this stage reads, in order of preference
+DATA_PATHS = [BASIC_DATA_PATH]
+
+# Decimal places kept in the exported prediction grid (the frontend shows
+# probabilities as percentages with two decimals)
+PREDICTION_PRECISION = 6
+
+# Draft position of the sample players in the prediction grid
+TYPICAL_DRAFT = 'Round 3'
+
+# Classifier settings (sensitivity_sweep.py checks how much the results depend on them)
+TEST_SIZE = 0.25
+RANDOM_STATE = 42
+N_ESTIMATORS = 100
 
 # Make sure the analysis directory exists
 os.makedirs('../../backend/analysis/advanced', exist_ok=True)
 
-def perform_advanced_analysis():
-    print("Performing advanced statistical analysis...")
-    
-    # Load the data
-    try:
-        df = pd.read_csv('../../backend/data/pro_bowlers_ras.csv')
-        print(f"Loaded data for {len(df)} players")
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return
-    
-    # Prepare the data
-    # Convert RAS to numeric
-    if 'RAS' in df.columns:
-        df['RAS_numeric'] = pd.to_numeric(df['RAS'], errors='coerce')
-    
-    # Convert Pro Bowls to numeric
-    pro_bowl_cols = ['Pro Bowls', 'ProBowls', 'Pro_Bowls']
-    for col in pro_bowl_cols:
-        if col in df.columns:
-            df['Pro_Bowls_numeric'] = pd.to_numeric(df[col], errors='coerce')
-            break
-    
-    # Handle position
-    pos_col = None
-    for col in ['Position', 'Pos']:
-        if col in df.columns:
-            pos_col = col
-            break
+# Persisted models plus the feature matrix they were trained on, reused by
+# incremental_models.py when a new season of data arrives
+MODEL_STATE_PATH = '../../backend/analysis/advanced/model_state.pkl'
+
+def prepare_features(df):
+    """Add the numeric RAS/Pro Bowl columns, position dummies and draft features used by the models"""
+    # Raw scraped frames are normalized to the canonical columns first
+    mapping = resolve_columns(df.columns)
+    if 'RAS_numeric' not in df.columns:
+        df = normalize_frame(df, mapping)
+    pos_col = 'Position' if 'Position' in mapping else None
     
     if pos_col:
         # Create dummy variables for positions
         position_dummies = pd.get_dummies(df[pos_col], prefix='pos')
         df = pd.concat([df, position_dummies], axis=1)
     
-    # Handle draft information
-    if 'Draft Year' in df.columns:
-        # Extract draft round if possible
-        try:
-            df['draft_round'] = df['Draft Year'].str.extract(r'Round (\d+)').astype(float)
-        except:
-            print("Couldn't extract draft round from Draft Year column")
+    # Draft round, undrafted flag and draft-capital value (common/draft.py)
+    if 'Draft' in df.columns:
+        features = draft_features(df['Draft'])
+        df = df.assign(**{col: features[col] for col in DRAFT_FEATURES})
+        if features['draft_round'].isna().all():
+            print("Couldn't parse draft round or pick from the Draft column")
+    
+    return df, pos_col
+
+def regression_subset(df):
+    """Players with both a RAS and a Pro Bowl count (the rows every model is fitted on)"""
+    return df.dropna(subset=['RAS_numeric', 'Pro_Bowls_numeric'])
+
+def available_draft_features(regression_df):
+    """Draft feature columns with at least one parsed value"""
+    return [col for col in DRAFT_FEATURES
+            if col in regression_df.columns and not regression_df[col].isna().all()]
+
+def make_classifiers(random_state=RANDOM_STATE, n_estimators=N_ESTIMATORS):
+    """Unfitted logistic regression and random forest with the analysis settings"""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.ensemble import RandomForestClassifier
+    
+    return (LogisticRegression(random_state=random_state, max_iter=1000),
+            RandomForestClassifier(n_estimators=n_estimators, random_state=random_state))
+
+def build_ml_matrix(regression_df, feature_columns=None, threshold=PRO_BOWL_THRESHOLD):
+    """Feature matrix and multiple-Pro-Bowl target for the classifiers
+    
+    When feature_columns is given (e.g. from persisted model state) the matrix
+    is aligned to it, with missing dummies filled as 0.
+    """
+    target = (regression_df['Pro_Bowls_numeric'] > threshold).astype(int)
+    
+    if feature_columns is None:
+        feature_columns = ['RAS_numeric']
+        
+        # Add position dummies if available
+        feature_columns.extend(col for col in regression_df.columns if col.startswith('pos_'))
+        
+        # Add draft features if available
+        feature_columns.extend(available_draft_features(regression_df))
+    
+    # Ensure all features are numeric and handle missing values
+    X_ml = regression_df.reindex(columns=feature_columns).fillna(0).astype(float)
+    return X_ml, target
+
+def build_prediction_grid(log_reg, rf, feature_columns, positions):
+    """Predicted Pro Bowl likelihood over a RAS grid for every position, as one batch"""
+    positions = [position for position in positions if position != 'DB']  # Skip DB position as requested earlier
+    ras_values = np.arange(1, 10.1, 0.1)
+    
+    grid = pd.DataFrame({
+        'RAS': np.tile(ras_values, len(positions)),
+        'Position': np.repeat(positions, len(ras_values))
+    })
+    
+    # Sample players with this RAS and position, a middle-round draft pick
+    # and every other feature at 0
+    sample = pd.DataFrame(0.0, index=grid.index, columns=feature_columns)
+    sample['RAS_numeric'] = grid['RAS']
+    for col in feature_columns:
+        if col.startswith('pos_'):
+            sample[col] = (grid['Position'] == col[len('pos_'):]).astype(float)
+    typical = draft_features(pd.Series([TYPICAL_DRAFT])).iloc[0]
+    for col in DRAFT_FEATURES:
+        if col in feature_columns:
+            sample[col] = typical[col]
+    
+    # Make predictions
+    try:
+        grid['LogisticRegression_Prob'] = log_reg.predict_proba(sample)[:, 1]
+    except:
+        grid['LogisticRegression_Prob'] = 0
+    
+    try:
+        grid['RandomForest_Prob'] = rf.predict_proba(sample)[:, 1]
+    except:
+        grid['RandomForest_Prob'] = 0
+    
+    return grid
+
+def save_model_state(state, path=MODEL_STATE_PATH):
+    with open(path, 'wb') as f:
+        pickle.dump(state, f)
+    print(f"Saved model state to {path}")
+
+def load_model_state(path=MODEL_STATE_PATH):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+# Models whose recorded tables can be rendered to the optional .txt summaries
+TEXT_SUMMARIES = {
+    'basic_regression': '../../backend/analysis/advanced/basic_regression.txt',
+    'advanced_regression': '../../backend/analysis/advanced/advanced_regression.txt',
+    'logistic_regression': '../../backend/analysis/advanced/logistic_regression_results.txt',
+    'random_forest': '../../backend/analysis/advanced/random_forest_results.txt'
+}
+
+def perform_advanced_analysis(text_summaries=False, df=None):
+    # The statistics and ML stacks are only imported when models are fitted
+    import statsmodels.api as sm
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+    
+    print("Performing advanced statistical analysis...")
+    run_id = new_run_id()
+    
+    # Load the data
+    if df is None:
+        df, source = load_dataset(DATA_PATHS)
+    if df is None:
+        print("Error loading data")
+        return
+    
+    # Prepare the data
+    df, pos_col = prepare_features(df)
     
     # Multiple Regression Analysis
     print("\nPerforming multiple regression analysis...")
     
     # Drop missing values for regression
-    regression_df = df.dropna(subset=['RAS_numeric', 'Pro_Bowls_numeric'])
+    regression_df = regression_subset(df)
     
     if len(regression_df) < 10:
         print("Not enough data for regression analysis")
@@ -71,14 +181,14 @@ def perform_advanced_analysis():
     y = regression_df['Pro_Bowls_numeric'].astype(float)
     
     model = sm.OLS(y, X).fit()
+    basic_tables = regression_tables(model)
     print("\nBasic Regression Results (Pro Bowls ~ RAS):")
-    print(model.summary().tables[1])
+    print(basic_tables['coefficients'])
     
     # Save the results
-    with open('../../backend/analysis/advanced/basic_regression.txt', 'w') as f:
-        f.write(str(model.summary()))
+    append_results(basic_tables, 'advanced_analytics', 'basic_regression', run_id)
     
-    # Advanced model: Include position and draft round if available
+    # Advanced model: Include position and draft features if available
     advanced_cols = ['RAS_numeric']
     
     # Add position dummies if available
@@ -87,24 +197,26 @@ def perform_advanced_analysis():
         # Take fewer dummy variables to avoid potential issues
         advanced_cols.extend(pos_dummy_cols)  # Exclude one for the dummy variable trap
     
-    # Add draft round if available
-    if 'draft_round' in regression_df.columns:
-        advanced_cols.append('draft_round')
+    # Add draft features if available; players whose draft position
+    # couldn't be parsed are left out of this model
+    draft_cols = available_draft_features(regression_df)
+    advanced_cols.extend(draft_cols)
+    advanced_df = regression_df.dropna(subset=draft_cols)
     
     # Run advanced model if we have enough variables
     if len(advanced_cols) > 1:
         # Convert data to float to avoid the object dtype error
         try:
-            X_adv = regression_df[advanced_cols].astype(float)
+            X_adv = advanced_df[advanced_cols].astype(float)
             X_adv = sm.add_constant(X_adv)
-            y_adv = y.astype(float)
+            y_adv = advanced_df['Pro_Bowls_numeric'].astype(float)
             
             advanced_model = sm.OLS(y_adv, X_adv).fit()
+            advanced_tables = regression_tables(advanced_model)
             print("\nAdvanced Regression Results (including position/draft):")
-            print(advanced_model.summary().tables[1])
+            print(advanced_tables['coefficients'])
             
-            with open('../../backend/analysis/advanced/advanced_regression.txt', 'w') as f:
-                f.write(str(advanced_model.summary()))
+            append_results(advanced_tables, 'advanced_analytics', 'advanced_regression', run_id)
         except Exception as e:
             print(f"Error in advanced regression: {e}")
             print("Skipping advanced regression analysis")
@@ -113,38 +225,22 @@ def perform_advanced_analysis():
     print("\nTraining machine learning models to predict Pro Bowl likelihood...")
     
     # Create a binary target: Did the player make multiple Pro Bowls?
-    regression_df['multiple_pro_bowls'] = (regression_df['Pro_Bowls_numeric'] > 1).astype(int)
-    
-    # Features for prediction
-    ml_features = ['RAS_numeric']
-    
-    # Add position dummies if available
-    if pos_dummy_cols:
-        # Limit the number of features to avoid issues
-        ml_features.extend(pos_dummy_cols)
-    
-    # Add draft round if available
-    if 'draft_round' in regression_df.columns and not regression_df['draft_round'].isna().all():
-        ml_features.append('draft_round')
-    
-    # Ensure all features are numeric and handle missing values
-    X_ml = regression_df[ml_features].fillna(0).astype(float)
-    y_ml = regression_df['multiple_pro_bowls'].astype(int)
+    X_ml, y_ml = build_ml_matrix(regression_df)
+    regression_df['multiple_pro_bowls'] = y_ml
     
     # Split data
     try:
-        X_train, X_test, y_train, y_test = train_test_split(X_ml, y_ml, test_size=0.25, random_state=42)
+        X_train, X_test, y_train, y_test = train_test_split(X_ml, y_ml, test_size=TEST_SIZE,
+                                                            random_state=RANDOM_STATE)
+        log_reg, rf = make_classifiers()
         
         # Logistic Regression
-        log_reg = LogisticRegression(random_state=42, max_iter=1000)
         log_reg.fit(X_train, y_train)
         
         y_pred_lr = log_reg.predict(X_test)
         accuracy_lr = accuracy_score(y_test, y_pred_lr)
         
         print(f"\nLogistic Regression Accuracy: {accuracy_lr:.4f}")
-        print("\nClassification Report:")
-        print(classification_report(y_test, y_pred_lr))
         
         # Feature importance from logistic regression
         feature_importance_lr = pd.DataFrame({
@@ -156,15 +252,12 @@ def perform_advanced_analysis():
         print(feature_importance_lr)
         
         # Save results
-        with open('../../backend/analysis/advanced/logistic_regression_results.txt', 'w') as f:
-            f.write(f"Logistic Regression Accuracy: {accuracy_lr:.4f}\n\n")
-            f.write("Classification Report:\n")
-            f.write(classification_report(y_test, y_pred_lr))
-            f.write("\nFeature Importance:\n")
-            f.write(feature_importance_lr.to_string())
+        lr_tables = classification_tables(y_test, y_pred_lr, feature_importance_lr)
+        print("\nClassification Report:")
+        print(lr_tables['classification_report'].round(2))
+        append_results(lr_tables, 'advanced_analytics', 'logistic_regression', run_id)
         
         # Random Forest for comparison
-        rf = RandomForestClassifier(n_estimators=100, random_state=42)
         rf.fit(X_train, y_train)
         
         y_pred_rf = rf.predict(X_test)
@@ -181,24 +274,22 @@ def perform_advanced_analysis():
         print("\nFeature Importance (Random Forest):")
         print(feature_importance_rf)
         
-        with open('../../backend/analysis/advanced/random_forest_results.txt', 'w') as f:
-            f.write(f"Random Forest Accuracy: {accuracy_rf:.4f}\n\n")
-            f.write("Classification Report:\n")
-            f.write(classification_report(y_test, y_pred_rf))
-            f.write("\nFeature Importance:\n")
-            f.write(feature_importance_rf.to_string())
+        append_results(classification_tables(y_test, y_pred_rf, feature_importance_rf),
+                       'advanced_analytics', 'random_forest', run_id)
     
     except Exception as e:
         print(f"Error in classification models: {e}")
         print("Creating simplified models for visualization...")
         # Create simple models for visualization purposes
-        log_reg = LogisticRegression(random_state=42, max_iter=1000)
+        log_reg, rf = make_classifiers()
         log_reg.fit(regression_df[['RAS_numeric']].fillna(0).astype(float), 
                    regression_df['multiple_pro_bowls'].astype(int))
         
-        rf = RandomForestClassifier(n_estimators=100, random_state=42)
         rf.fit(regression_df[['RAS_numeric']].fillna(0).astype(float), 
               regression_df['multiple_pro_bowls'].astype(int))
+        
+        X_ml = regression_df[['RAS_numeric']].fillna(0).astype(float)
+        X_train, X_test, y_train, y_test = X_ml, X_ml.iloc[:0], y_ml, y_ml.iloc[:0]
     
     # Generate prediction dataset for frontend visualization
     # This creates a dataset with predictions for different RAS values by position
@@ -208,61 +299,33 @@ def perform_advanced_analysis():
     # Get unique positions
     positions = df[pos_col].unique() if pos_col else ['All']
     
-    predictions_data = []
-    
-    for position in positions:
-        if position != 'DB':  # Skip DB position as requested earlier
-            # Create a range of RAS values
-            for ras in np.arange(1, 10.1, 0.1):
-                # Create a sample player with this RAS and position
-                sample_data = {'RAS_numeric': [ras]}
-                
-                # Add position dummies if needed
-                if pos_dummy_cols and len(pos_dummy_cols) > 0:
-                    for pos_dummy in pos_dummy_cols:
-                        if pos_dummy in X_ml.columns:  # Only add if it was used in training
-                            pos_name = pos_dummy.split('_')[1]
-                            sample_data[pos_dummy] = 1 if pos_name == position else 0
-                
-                # Add a middle-round draft pick if used in training
-                if 'draft_round' in X_ml.columns:
-                    sample_data['draft_round'] = 3
-                
-                # Create sample DataFrame with only columns used in training
-                sample = pd.DataFrame(sample_data)
-                for col in X_ml.columns:
-                    if col not in sample.columns:
-                        sample[col] = 0
-                
-                sample = sample[X_ml.columns].fillna(0).astype(float)
-                
-                # Make predictions
-                try:
-                    prob_lr = log_reg.predict_proba(sample)[0][1]
-                except:
-                    prob_lr = 0
-                    
-                try:
-                    prob_rf = rf.predict_proba(sample)[0][1]
-                except:
-                    prob_rf = 0
-                
-                predictions_data.append({
-                    'RAS': ras,
-                    'Position': position,
-                    'LogisticRegression_Prob': prob_lr,
-                    'RandomForest_Prob': prob_rf
-                })
-    
-    # Create a dataframe and save to JSON
-    predictions_df = pd.DataFrame(predictions_data)
-    
-    # Ensure directory exists
-    os.makedirs('../../frontend/public/data', exist_ok=True)
-    
-    predictions_df.to_json('../../frontend/public/data/ml_predictions.json', orient='records')
+    predictions_df = build_prediction_grid(log_reg, rf, list(X_ml.columns), positions)
+    
+    write_frame_json('../../frontend/public/data/ml_predictions.json', predictions_df, precision=PREDICTION_PRECISION)
+    
+    # Persist the models and their training data for incremental updates
+    save_model_state({
+        'log_reg': log_reg,
+        'rf': rf,
+        'feature_columns': list(X_ml.columns),
+        'positions': list(positions),
+        'X_train': X_train,
+        'y_train': y_train,
+        'X_test': X_test,
+        'y_test': y_test
+    })
+    
+    # Machine-readable results of this run for the frontend, plus the
+    # optional plain-text rendering of the same tables
+    results = load_results(run_id=run_id)
+    export_latest_run(results, run_id)
+    if text_summaries:
+        for model_name, path in TEXT_SUMMARIES.items():
+            if (results['model'] == model_name).any():
+                with open(path, 'w') as f:
+                    f.write(render_text(results, model_name, run_id))
     
     print("Advanced analysis complete. Results saved to backend/analysis/advanced/ and frontend/public/data/")
 
 if __name__ == "__main__":
-    perform_advanced_analysis()
\ No newline at end of file
+    perform_advanced_analysis(text_summaries='--text-summaries' in sys.argv)
\ No newline at end of file
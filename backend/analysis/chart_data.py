@@ -0,0 +1,196 @@
+import pandas as pd
+import numpy as np
+import warnings
+
+# Every position's curves are evaluated on the same RAS grid, so the frontend
+# can chart any position (or overlay several) without recomputing anything
+RAS_GRID = np.round(np.linspace(0, 10, 101), 2)
+
+# One-point RAS histogram bins
+HIST_EDGES = np.arange(0, 11, dtype=float)
+
+# Positions with fewer players than this get no charts (position_stats.json
+# still lists them, flagged as small samples)
+MIN_PLAYERS = 3
+
+# Confidence level of the regression bands
+CI_LEVEL = 0.95
+
+# Players per block when evaluating the KDE kernels (bounds the grid x players matrix)
+KDE_CHUNK = 20000
+
+POOLED_LABEL = 'All'
+
+CHARTS_PATH = '../../frontend/public/data/position_charts.json'
+
+
+def position_codes(positions, min_players=MIN_PLAYERS):
+    """Sorted labels of positions with at least min_players rows and each row's code (-1 = excluded)"""
+    labels, codes, counts = np.unique(np.asarray(positions, dtype=str), return_inverse=True, return_counts=True)
+    keep = counts >= min_players
+    remap = np.full(len(labels), -1)
+    remap[keep] = np.arange(keep.sum())
+    return [str(label) for label in labels[keep]], remap[codes]
+
+
+def grouped_histograms(codes, n_groups, x, edges=HIST_EDGES):
+    """(groups, bins) counts from one bincount over group * n_bins + bin"""
+    n_bins = len(edges) - 1
+    valid = (codes >= 0) & (x >= edges[0]) & (x <= edges[-1])
+    bins = np.clip(np.searchsorted(edges, x[valid], side='right') - 1, 0, n_bins - 1)
+    counts = np.bincount(codes[valid] * n_bins + bins, minlength=n_groups * n_bins)
+    return counts.reshape(n_groups, n_bins)
+
+
+def grouped_moments(codes, n_groups, x, y=None):
+    """Per-group n, sum x, sum x^2 (and sum y, y^2, xy when y is given) via bincount"""
+    valid = (codes >= 0) & ~np.isnan(x)
+    if y is not None:
+        valid &= ~np.isnan(y)
+    c, xv = codes[valid], x[valid]
+    moments = {
+        'n': np.bincount(c, minlength=n_groups).astype(float),
+        'sx': np.bincount(c, xv, minlength=n_groups),
+        'sxx': np.bincount(c, xv * xv, minlength=n_groups)
+    }
+    if y is not None:
+        yv = y[valid]
+        moments['sy'] = np.bincount(c, yv, minlength=n_groups)
+        moments['syy'] = np.bincount(c, yv * yv, minlength=n_groups)
+        moments['sxy'] = np.bincount(c, xv * yv, minlength=n_groups)
+    return moments
+
+
+def grouped_kde(codes, n_groups, x, grid=RAS_GRID, chunk=KDE_CHUNK):
+    """Gaussian KDE (Scott's rule bandwidth, as scipy/seaborn) of every group on a shared grid
+
+    The kernels of a block of players are summed into their groups with one
+    matrix product against the block's one-hot group matrix. A group without
+    a bandwidth (fewer than two distinct values) gets a NaN curve and leaves
+    the other groups untouched:
+
+    >>> codes = np.array([0, 0, 0, 0, 1, 1, 1])
+    >>> x = np.array([5.0, 6.0, 7.0, 8.0, 9.0, 9.0, 9.0])
+    >>> density = grouped_kde(codes, 2, x)
+    >>> bool(np.allclose(density[0], grouped_kde(codes[:4], 1, x[:4])[0])), bool(np.isnan(density[1]).all())
+    (True, True)
+    """
+    valid = (codes >= 0) & ~np.isnan(x)
+    c, xv = codes[valid], x[valid]
+    m = grouped_moments(c, n_groups, xv)
+    n = m['n']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt((m['sxx'] - m['sx'] ** 2 / n) / (n - 1))
+        bandwidth = std * n ** (-1 / 5)
+    bandwidth = np.where(bandwidth > 0, bandwidth, np.nan)
+
+    # Players of groups without a bandwidth would put NaN kernels into the
+    # matrix product, and NaN * 0 would spread them to every other group
+    usable = ~np.isnan(bandwidth[c])
+    c, xv = c[usable], xv[usable]
+
+    density = np.zeros((n_groups, len(grid)))
+    groups = np.arange(n_groups)
+    for start in range(0, len(xv), chunk):
+        xc, cc = xv[start:start + chunk], c[start:start + chunk]
+        h = bandwidth[cc]
+        kernels = np.exp(-0.5 * ((grid[:, None] - xc[None, :]) / h) ** 2) / h
+        one_hot = (cc[:, None] == groups[None, :]).astype(float)
+        density += (kernels @ one_hot).T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density /= (n * np.sqrt(2 * np.pi))[:, None]
+    density[np.isnan(bandwidth)] = np.nan
+    return density
+
+
+def grouped_regression(codes, n_groups, x, y, grid=RAS_GRID, level=CI_LEVEL):
+    """Closed-form OLS of y on x per group with the confidence band of the mean on grid"""
+    from scipy import stats
+
+    m = grouped_moments(codes, n_groups, x, y)
+    n = m['n']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = m['sx'] / n
+        sxx = m['sxx'] - m['sx'] ** 2 / n
+        syy = m['syy'] - m['sy'] ** 2 / n
+        sxy = m['sxy'] - m['sx'] * m['sy'] / n
+        slope = sxy / sxx
+        intercept = m['sy'] / n - slope * x_mean
+        r = sxy / np.sqrt(sxx * syy)
+        residual_var = np.maximum(syy - slope * sxy, 0) / (n - 2)
+
+        fit = intercept[:, None] + slope[:, None] * grid[None, :]
+        se = np.sqrt(residual_var[:, None] * (1 / n[:, None] + (grid[None, :] - x_mean[:, None]) ** 2 / sxx[:, None]))
+        t_crit = stats.t.ppf(0.5 + level / 2, np.where(n > 2, n - 2, np.nan))
+    undefined = (n <= 2) | ~(sxx > 0)
+    for array in (slope, intercept, r):
+        array[undefined] = np.nan
+    fit[undefined] = np.nan
+    return {
+        'n': n.astype(int),
+        'slope': slope,
+        'intercept': intercept,
+        'r': r,
+        'fit': fit,
+        'lower': fit - t_crit[:, None] * se,
+        'upper': fit + t_crit[:, None] * se
+    }
+
+
+def grouped_box_stats(codes, labels, x):
+    """Quartiles and 1.5 IQR whiskers per group (what the RAS box plot shows)"""
+    valid = (codes >= 0) & ~np.isnan(x)
+    values = pd.Series(x[valid])
+    quartiles = values.groupby(codes[valid]).quantile([0.25, 0.5, 0.75]).unstack().reindex(range(len(labels)))
+    q1, median, q3 = (quartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    # Whiskers stop at the most extreme points within 1.5 IQR of the box
+    lower_fence, upper_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = pd.Series(x[valid]).where((x[valid] >= lower_fence[codes[valid]]) & (x[valid] <= upper_fence[codes[valid]]))
+    whiskers = inside.groupby(codes[valid]).agg(['min', 'max']).reindex(range(len(labels)))
+    return {'q1': q1, 'median': median, 'q3': q3,
+            'whisker_low': whiskers['min'].to_numpy(), 'whisker_high': whiskers['max'].to_numpy()}
+
+
+def build_chart_data(df, pos_col='Position', min_players=MIN_PLAYERS):
+    """Histograms, KDEs, regression lines/bands and box stats for every position plus all players"""
+    labels, codes = position_codes(df[pos_col].astype('string').fillna('Unknown'), min_players)
+    x = df['RAS_numeric'].to_numpy(dtype=float)
+    y = df['Pro_Bowls_numeric'].to_numpy(dtype=float)
+
+    # Every player appears a second time in the pooled group, appended after
+    # the positions, so one pass computes both
+    labels = labels + [POOLED_LABEL]
+    n_groups = len(labels)
+    codes = np.concatenate([codes, np.full(len(df), n_groups - 1)])
+    x = np.concatenate([x, x])
+    y = np.concatenate([y, y])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return {
+            'positions': labels,
+            'players': np.bincount(codes[codes >= 0], minlength=n_groups),
+            'grid': RAS_GRID,
+            'bin_edges': HIST_EDGES,
+            'histogram': grouped_histograms(codes, n_groups, x),
+            'kde': grouped_kde(codes, n_groups, x),
+            'regression': grouped_regression(codes, n_groups, x, y),
+            'box': grouped_box_stats(codes, labels, x)
+        }
+
+
+def position_slice(chart_data, position):
+    """One position's arrays from the chart data (for rendering or the render cache key)"""
+    i = chart_data['positions'].index(position)
+    return {
+        'histogram': chart_data['histogram'][i],
+        'kde': chart_data['kde'][i],
+        'players': chart_data['players'][i],
+        **{f"regression_{key}": value[i] for key, value in chart_data['regression'].items()}
+    }
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
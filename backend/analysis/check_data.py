@@ -1,46 +1,65 @@
 import pandas as pd
 import os
+import sys
+import time
+
+from ras_engine import resolve_measurement_columns
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import resolve_columns, normalize_frame
+from common.quality import check_quality, quarantine_rows, write_quality_report
+
+MEASUREMENTS_PATHS = ['../../backend/data/player_detailed_measurements.csv',
+                      '../../backend/data/player_detailed_measurements.json']
 
 def check_measurements_data():
     print("Checking detailed measurements data...")
-    
+
     # Try to load the detailed measurements
     try:
-        # Try CSV first as it's easier to inspect
-        if os.path.exists('../../backend/data/player_detailed_measurements.csv'):
-            df = pd.read_csv('../../backend/data/player_detailed_measurements.csv')
-        elif os.path.exists('../../backend/data/player_detailed_measurements.json'):
-            df = pd.read_json('../../backend/data/player_detailed_measurements.json')
-        else:
+        path = next((p for p in MEASUREMENTS_PATHS if os.path.exists(p)), None)
+        if path is None:
             print("No detailed measurements file found")
             return
-            
+        df = pd.read_json(path) if path.endswith('.json') else pd.read_csv(path)
+
         print(f"Loaded data for {len(df)} players")
         print(f"Columns in the data: {list(df.columns)}")
-        
+        print(f"Canonical column mapping: {resolve_columns(df.columns)}")
+
         # Print first few rows to inspect
         print("\nSample data (first 3 rows):")
         print(df.head(3).to_string())
-        
-        # Check for measurement columns
-        measurement_terms = ['height', 'weight', 'bench', 'forty', '40_', '40-yard', 'sprint', 
-                            'dash', 'vertical', 'jump', 'broad', 'shuttle', 'cone', 'drill']
-        
-        potential_measurement_cols = []
-        for col in df.columns:
-            if any(term in col.lower() for term in measurement_terms):
-                potential_measurement_cols.append(col)
-        
-        print(f"\nFound {len(potential_measurement_cols)} potential measurement columns: {potential_measurement_cols}")
-        
+
+        # Check for measurement columns the RAS engine recognizes
+        measurement_cols = resolve_measurement_columns(df.columns)
+        print(f"\nFound {len(measurement_cols)} measurement columns: {measurement_cols}")
+
         # If no measurement columns, it means the scraper didn't capture them
-        if len(potential_measurement_cols) == 0:
+        if len(measurement_cols) == 0:
             print("\nNo detailed measurements found in the data.")
             print("The scraper likely didn't extract the specific athletic measurements from the player pages.")
             print("Consider updating the scraper to extract these measurements properly.")
-        
+
+        # Data quality checks (the same ones load_dataset runs at ingest)
+        start = time.perf_counter()
+        clean = normalize_frame(df)
+        report, failures = check_quality(clean, os.path.basename(path))
+        quarantined = quarantine_rows(clean, failures)
+        print(f"\nData quality checks on {report['rows']} rows took {(time.perf_counter() - start) * 1000:.1f} ms")
+        for name, check in report['checks'].items():
+            if check['failed']:
+                print(f"  {name}: {check['failed']} rows fail {check['column']} {check['rule']}")
+        for col in report['high_null_columns']:
+            print(f"  {col}: {report['null_rates'][col]:.0%} missing")
+        report_path, quarantine_path = write_quality_report(report, quarantined, path)
+        print(f"{report['passed']} rows passed, {report['quarantined']} quarantined")
+        print(f"Quality report saved to {report_path}")
+        if len(quarantined):
+            print(f"Quarantined rows saved to {quarantine_path}")
+
     except Exception as e:
         print(f"Error checking data: {e}")
 
 if __name__ == "__main__":
-    check_measurements_data()
\ No newline at end of file
+    check_measurements_data()
@@ -0,0 +1,172 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from results_store import new_run_id, result_rows, append_rows
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.shared_arrays import share_arrays, release_arrays, init_worker, worker_arrays
+from common.schema import load_dataset, BASIC_DATA_PATH
+from common.artifacts import write_frame_json
+
+# Pro Bowl counts the threshold models predict reaching
+THRESHOLDS = [1, 3, 5]
+
+# Positions with fewer players than this are only covered by the pooled fit
+MIN_PLAYERS = 8
+
+# RAS values the fitted curves are evaluated at
+RAS_GRID = np.round(np.arange(0, 10.01, 0.1), 1)
+
+CURVE_COLUMNS = ['Poisson_Mean', 'NegBin_Mean'] + [f"P_AtLeast_{k}" for k in THRESHOLDS]
+
+
+def _fit_glm(y, X, family):
+    import statsmodels.api as sm
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return sm.GLM(y, X, family=family).fit()
+
+
+def fit_count_models(ras, pro_bowls):
+    """Poisson, negative-binomial and threshold fits of Pro Bowls on RAS
+
+    Returns the curves evaluated on RAS_GRID and a list of coefficient rows.
+    Models that can't be fitted (a single class, perfect separation) are NaN.
+    """
+    import statsmodels.api as sm
+    
+    valid = ~np.isnan(ras) & ~np.isnan(pro_bowls)
+    y = pro_bowls[valid]
+    X = sm.add_constant(ras[valid], has_constant='add')
+    X_grid = sm.add_constant(RAS_GRID, has_constant='add')
+
+    curves = {}
+    params = []
+
+    poisson = _fit_glm(y, X, sm.families.Poisson())
+    curves['Poisson_Mean'] = poisson.predict(X_grid)
+    params.append(('Poisson', poisson.params, poisson.bse))
+
+    # The negative-binomial GLM needs the dispersion alpha, estimated by the
+    # NB2 maximum-likelihood model first
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            alpha = sm.NegativeBinomial(y, X).fit(disp=0).params[-1]
+        negbin = _fit_glm(y, X, sm.families.NegativeBinomial(alpha=max(alpha, 1e-8)))
+        curves['NegBin_Mean'] = negbin.predict(X_grid)
+        params.append(('NegBin', negbin.params, negbin.bse))
+    except Exception as e:
+        print(f"Negative binomial fit failed: {e}")
+        curves['NegBin_Mean'] = np.full(len(RAS_GRID), np.nan)
+
+    for k in THRESHOLDS:
+        column = f"P_AtLeast_{k}"
+        reached = (y >= k).astype(float)
+        if reached.min() == reached.max():
+            # Every player is on the same side of the threshold
+            curves[column] = np.full(len(RAS_GRID), reached[0] if len(reached) else np.nan)
+            continue
+        try:
+            logit = _fit_glm(reached, X, sm.families.Binomial())
+            curves[column] = logit.predict(X_grid)
+            params.append((f"AtLeast_{k}", logit.params, logit.bse))
+        except Exception as e:
+            print(f"Threshold model for >= {k} Pro Bowls failed: {e}")
+            curves[column] = np.full(len(RAS_GRID), np.nan)
+
+    return curves, params
+
+
+def _fit_position(task):
+    """Worker task: fit one position's slice of the shared arrays"""
+    position, start, stop = task
+    arrays = worker_arrays()
+    ras = arrays['ras'][start:stop]
+    pro_bowls = arrays['pro_bowls'][start:stop]
+    curves, params = fit_count_models(ras, pro_bowls)
+    return position, int(np.sum(~np.isnan(ras) & ~np.isnan(pro_bowls))), curves, params
+
+
+def fit_all_positions(df, pos_col, max_workers=None):
+    """Fit every position (plus a pooled 'All' fit) concurrently on a process pool
+
+    The RAS and Pro Bowl columns are placed in shared memory once, sorted by
+    position, so each task only ships a (position, start, stop) slice.
+    """
+    df = df.dropna(subset=['RAS_numeric', 'Pro_Bowls_numeric']).sort_values(pos_col, kind='stable')
+    ras = df['RAS_numeric'].to_numpy(dtype=float)
+    pro_bowls = df['Pro_Bowls_numeric'].to_numpy(dtype=float)
+
+    positions = df[pos_col].to_numpy()
+    labels, starts, counts = np.unique(positions, return_index=True, return_counts=True)
+    tasks = [('All', 0, len(df))]
+    tasks.extend((label, int(start), int(start + count))
+                 for label, start, count in zip(labels, starts, counts) if count >= MIN_PLAYERS)
+
+    handles, spec = share_arrays({'ras': ras, 'pro_bowls': pro_bowls})
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(spec,)) as pool:
+            results = list(pool.map(_fit_position, tasks))
+    finally:
+        release_arrays(handles)
+    return results
+
+
+def build_curve_table(results):
+    """One row per (position, RAS) with every model's fitted value"""
+    frames = []
+    for position, n_players, curves, _ in results:
+        frame = pd.DataFrame({'Position': position, 'Players': n_players, 'RAS': RAS_GRID})
+        for column in CURVE_COLUMNS:
+            frame[column] = np.round(curves[column], 4)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def record_params(results, run_id):
+    """Append every fitted model's coefficients to the shared results file"""
+    rows = []
+    for position, n_players, _, params in results:
+        for model, coefs, errors in params:
+            coefficients = pd.DataFrame({'coef': coefs, 'std_err': errors, 'players': n_players},
+                                        index=['const', 'RAS_numeric'])
+            rows.append(result_rows({'coefficients': coefficients}, 'count_models', f"{position}_{model}", run_id))
+    append_rows(pd.concat(rows, ignore_index=True))
+
+
+def run_count_models():
+    print("Fitting count and threshold models for Pro Bowl selections...")
+
+    df, source = load_dataset([BASIC_DATA_PATH])
+    if df is None:
+        print("Error loading data")
+        return
+    if df['Pro_Bowls_numeric'].isna().all():
+        print("Pro Bowl column not found in data")
+        return
+    pos_col = 'Position'
+
+    # Filter out DB position as requested earlier
+    df = df[df[pos_col] != 'DB']
+
+    start = time.perf_counter()
+    results = fit_all_positions(df, pos_col)
+    print(f"Fitted {len(results)} position models in {time.perf_counter() - start:.2f}s")
+
+    record_params(results, new_run_id())
+
+    # Compact column-oriented table for the frontend
+    write_frame_json('../../frontend/public/data/count_model_curves.json', build_curve_table(results),
+                     orient='split', index=False)
+    print("Saved count model curves to frontend/public/data/count_model_curves.json")
+
+
+if __name__ == "__main__":
+    run_count_models()
@@ -0,0 +1,180 @@
+import pandas as pd
+import json
+import sys
+import time
+
+from advanced_analytics import (prepare_features, build_ml_matrix, build_prediction_grid,
+                                load_model_state, save_model_state, PREDICTION_PRECISION)
+from results_store import new_run_id, append_results
+from common.artifacts import write_frame_json
+
+# Trees added to the random forest for every incremental update
+EXTRA_TREES = 25
+
+# Iteration budget for the warm-started logistic regression; it starts from the
+# previous coefficients so only a few passes are needed to converge again
+WARM_START_MAX_ITER = 100
+
+# Recommend a full rebuild once the incremental models trail a full retrain
+# by more than this much accuracy
+REBUILD_TOLERANCE = 0.02
+
+REPORT_PATH = '../../backend/analysis/advanced/incremental_report.json'
+
+
+def warm_start_logistic(log_reg, X, y):
+    """Refit the logistic regression starting from its current coefficients"""
+    from sklearn.base import clone
+    
+    updated = clone(log_reg)
+    updated.set_params(warm_start=True, max_iter=WARM_START_MAX_ITER)
+    # clone() drops fitted attributes, so seed the solver with the previous fit
+    updated.coef_ = log_reg.coef_.copy()
+    updated.intercept_ = log_reg.intercept_.copy()
+    updated.fit(X, y)
+    return updated
+
+
+def grow_forest(rf, X_new, y_new, extra_trees=EXTRA_TREES):
+    """Add trees trained only on the new rows to an already fitted random forest"""
+    if y_new.nunique() < 2:
+        # New trees must see both classes to stay compatible with the existing ones
+        print("New data contains a single class, keeping the existing forest")
+        return rf
+    rf.set_params(warm_start=True, n_estimators=rf.n_estimators + extra_trees)
+    rf.fit(X_new, y_new)
+    return rf
+
+
+def update_models(new_df, state=None, compare=True, extra_trees=EXTRA_TREES):
+    """Fold a new season of players into the persisted models without a full retrain
+
+    Returns the updated state and a report comparing incremental and full
+    retrain accuracy on the persisted test set plus a holdout of the new rows.
+    """
+    from sklearn.base import clone
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+    
+    if state is None:
+        state = load_model_state()
+    feature_columns = state['feature_columns']
+
+    new_df, pos_col = prepare_features(new_df)
+    new_df = new_df.dropna(subset=['RAS_numeric', 'Pro_Bowls_numeric'])
+    if len(new_df) == 0:
+        print("No usable rows in the new data")
+        return state, None
+
+    # Positions the models have never seen can't be added without changing the feature set
+    unseen = sorted({col for col in new_df.columns if col.startswith('pos_')} - set(feature_columns))
+    if unseen:
+        print(f"Warning: positions not in the trained feature set: {unseen}")
+
+    X_new, y_new = build_ml_matrix(new_df, feature_columns)
+    if len(X_new) >= 8 and y_new.nunique() > 1:
+        X_new_train, X_new_test, y_new_train, y_new_test = train_test_split(
+            X_new, y_new, test_size=0.25, random_state=42)
+    else:
+        X_new_train, X_new_test, y_new_train, y_new_test = X_new, X_new.iloc[:0], y_new, y_new.iloc[:0]
+
+    X_train = pd.concat([state['X_train'], X_new_train])
+    y_train = pd.concat([state['y_train'], y_new_train])
+    X_eval = pd.concat([state['X_test'], X_new_test])
+    y_eval = pd.concat([state['y_test'], y_new_test])
+
+    start = time.perf_counter()
+    log_reg = warm_start_logistic(state['log_reg'], X_train, y_train)
+    rf = grow_forest(state['rf'], X_new_train, y_new_train, extra_trees)
+    incremental_time = time.perf_counter() - start
+    print(f"Incremental update on {len(X_new_train)} new rows took {incremental_time:.2f}s")
+
+    report = {
+        'new_rows': int(len(X_new)),
+        'training_rows': int(len(X_train)),
+        'evaluation_rows': int(len(X_eval)),
+        'forest_trees': int(rf.n_estimators),
+        'unseen_positions': unseen,
+        'incremental_seconds': incremental_time
+    }
+
+    if len(X_eval) > 0:
+        report['incremental_accuracy'] = {
+            'LogisticRegression': accuracy_score(y_eval, log_reg.predict(X_eval)),
+            'RandomForest': accuracy_score(y_eval, rf.predict(X_eval))
+        }
+
+    if compare and len(X_eval) > 0:
+        start = time.perf_counter()
+        full_lr = clone(state['log_reg']).set_params(warm_start=False).fit(X_train, y_train)
+        full_rf = clone(state['rf']).set_params(warm_start=False, n_estimators=rf.n_estimators).fit(X_train, y_train)
+        report['full_retrain_seconds'] = time.perf_counter() - start
+        report['full_retrain_accuracy'] = {
+            'LogisticRegression': accuracy_score(y_eval, full_lr.predict(X_eval)),
+            'RandomForest': accuracy_score(y_eval, full_rf.predict(X_eval))
+        }
+        shortfall = max(report['full_retrain_accuracy'][name] - report['incremental_accuracy'][name]
+                        for name in report['incremental_accuracy'])
+        report['max_accuracy_shortfall'] = shortfall
+        report['full_rebuild_recommended'] = bool(shortfall > REBUILD_TOLERANCE or unseen)
+    else:
+        report['full_rebuild_recommended'] = bool(unseen)
+
+    positions = list(state['positions'])
+    if pos_col:
+        positions.extend(p for p in new_df[pos_col].unique() if p not in positions)
+
+    state = dict(state, log_reg=log_reg, rf=rf, positions=positions,
+                 X_train=X_train, y_train=y_train, X_test=X_eval, y_test=y_eval)
+    return state, report
+
+
+def run_incremental_update(new_data_path):
+    print(f"Updating models with new data from {new_data_path}...")
+
+    try:
+        new_df = pd.read_csv(new_data_path)
+        print(f"Loaded {len(new_df)} new rows")
+    except Exception as e:
+        print(f"Error loading new data: {e}")
+        return
+
+    try:
+        state = load_model_state()
+    except FileNotFoundError:
+        print("No persisted model state found. Run advanced_analytics.py for a full build first.")
+        return
+
+    state, report = update_models(new_df, state)
+    if report is None:
+        return
+
+    for name, accuracy in report.get('incremental_accuracy', {}).items():
+        full = report.get('full_retrain_accuracy', {}).get(name)
+        comparison = f" (full retrain: {full:.4f})" if full is not None else ""
+        print(f"{name} accuracy after incremental update: {accuracy:.4f}{comparison}")
+
+    if report['full_rebuild_recommended']:
+        print("Incremental models have drifted from a full retrain, run advanced_analytics.py to rebuild")
+
+    # Refresh the frontend predictions from the updated models
+    predictions_df = build_prediction_grid(state['log_reg'], state['rf'], state['feature_columns'], state['positions'])
+    write_frame_json('../../frontend/public/data/ml_predictions.json', predictions_df, precision=PREDICTION_PRECISION)
+
+    save_model_state(state)
+
+    with open(REPORT_PATH, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved incremental update report to {REPORT_PATH}")
+
+    if 'incremental_accuracy' in report:
+        accuracy = pd.DataFrame({'incremental': report['incremental_accuracy'],
+                                 'full_retrain': report.get('full_retrain_accuracy')})
+        append_results({'accuracy': accuracy}, 'incremental_models', 'model_update', new_run_id())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python incremental_models.py <new_season.csv>")
+        sys.exit(1)
+    run_incremental_update(sys.argv[1])
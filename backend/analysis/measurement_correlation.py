@@ -1,139 +1,116 @@
 import pandas as pd
-import numpy as np
 import os
-import json
-import re
+import sys
 
-def analyze_measurement_correlations():
-    print("Analyzing correlations between athletic measurements and Pro Bowl success...")
-    
-    # Create output directory
-    os.makedirs('../../backend/analysis/visualizations', exist_ok=True)
-    os.makedirs('../../frontend/public/data', exist_ok=True)
-    
-    # Try to load the detailed measurements
-    try:
-        # Try JSON first as it preserves data types better
-        if os.path.exists('../../backend/data/player_detailed_measurements.json'):
-            df = pd.read_json('../../backend/data/player_detailed_measurements.json')
-        else:
-            df = pd.read_csv('../../backend/data/player_detailed_measurements.csv')
-            
-        print(f"Loaded detailed measurements for {len(df)} players")
-        print(f"Available columns: {list(df.columns)}")
-    except Exception as e:
-        print(f"Detailed measurements not available: {e}")
-        print("Falling back to basic data")
-        
-        try:
-            df = pd.read_csv('../../backend/data/pro_bowlers_ras.csv')
-            print(f"Loaded basic data for {len(df)} players")
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            return
-    
-    # Convert measurements to numeric values
-    measurement_cols = []
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import load_dataset, COLUMN_ALIASES, NUMERIC_COLUMNS, BASIC_DATA_PATH, PRO_BOWL_THRESHOLD
+from common.artifacts import write_json, write_text
+from common.serialize import frame_nested
+from common.cache import cached
+
+DETAILED_MEASUREMENTS_PATHS = ['../../backend/data/player_detailed_measurements.json',
+                               '../../backend/data/player_detailed_measurements.csv']
+
+# Source files this stage reads, in order of preference: the detailed
+# measurements (JSON first as it preserves data types better), then the basic data
+DATA_PATHS = DETAILED_MEASUREMENTS_PATHS + [BASIC_DATA_PATH]
+
+# Identity and outcome columns that are never treated as measurements
+NON_MEASUREMENT_COLUMNS = set(COLUMN_ALIASES) | {f"{col}_numeric" for col in NUMERIC_COLUMNS} | {'player_id'}
+
+# Columns need values for more than this share of players to be correlated
+MIN_NON_NULL_FRACTION = 0.1
+
+@cached
+def numeric_measurements(df):
+    """Numeric measurement columns: text columns become <column>_numeric, numeric ones are kept"""
+    measurements = {}
     for col in df.columns:
         # Skip non-measurement columns
-        if col in ['player_name', 'position', 'profile_url', 'player_id']:
+        if col in NON_MEASUREMENT_COLUMNS:
             continue
-            
-        # Process the column if it might contain a measurement
-        try:
-            # Extract numeric values using regex
-            if df[col].dtype == 'object':
-                # Create a new numeric column
-                numeric_col = f"{col}_numeric"
-                
-                # Extract numbers from strings like "4.50 seconds" or "35.5 inches"
-                df[numeric_col] = df[col].astype(str).apply(
-                    lambda x: re.search(r'(\d+\.\d+|\d+)', x).group(1) if re.search(r'(\d+\.\d+|\d+)', x) else np.nan
-                ).astype(float)
-                
-                measurement_cols.append(numeric_col)
-            else:
-                measurement_cols.append(col)
-        except Exception as e:
-            print(f"Could not convert column {col} to numeric: {e}")
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            # Extract numbers from strings like "4.50 seconds" or "35.5 inches"
+            extracted = df[col].astype(str).str.extract(r'(\d+\.\d+|\d+)')[0]
+            measurements[f"{col}_numeric"] = pd.to_numeric(extracted, errors='coerce').astype(float)
+        else:
+            measurements[col] = df[col]
+    return pd.DataFrame(measurements, index=df.index)
+
+def valid_columns(df, min_fraction=MIN_NON_NULL_FRACTION):
+    """Columns of df with values for more than min_fraction of the rows"""
+    return [col for col in df.columns if df[col].notna().sum() > len(df) * min_fraction]
+
+# RAS and the success metrics, kept after the measurements in the matrix
+IMPORTANT_COLUMNS = ['ras_numeric', 'pro_bowls_numeric', 'multiple_pro_bowls']
+
+def correlation_matrix(df, threshold=PRO_BOWL_THRESHOLD, min_fraction=MIN_NON_NULL_FRACTION):
+    """Correlations between the measurements, RAS and Pro Bowl success
+
+    Returns (matrix, measurement columns found); the matrix is None when too
+    few columns have enough values.
+    """
+    # Convert measurements to numeric values
+    measurements = numeric_measurements(df)
+    measurement_cols = list(measurements.columns)
+    df = df.assign(**{col: measurements[col] for col in measurement_cols if col not in df.columns})
     
-    print(f"Processed {len(measurement_cols)} numeric measurement columns")
+    df['pro_bowls_numeric'] = df['Pro_Bowls_numeric']
+    df['multiple_pro_bowls'] = (df['pro_bowls_numeric'] > threshold).astype(int)
+    success_cols = ['pro_bowls_numeric', 'multiple_pro_bowls']
     
-    # Handle Pro Bowl data
-    if 'pro_bowls' in df.columns:
-        df['pro_bowls_numeric'] = pd.to_numeric(df['pro_bowls'], errors='coerce')
-        df['multiple_pro_bowls'] = (df['pro_bowls_numeric'] > 1).astype(int)
-        success_cols = ['pro_bowls_numeric', 'multiple_pro_bowls']
-    else:
-        # Try to find Pro Bowl columns in the original data
-        success_cols = []
-        for col in ['Pro_Bowls', 'ProBowls', 'Pro Bowls']:
-            if col in df.columns:
-                df['pro_bowls_numeric'] = pd.to_numeric(df[col], errors='coerce')
-                df['multiple_pro_bowls'] = (df['pro_bowls_numeric'] > 1).astype(int)
-                success_cols = ['pro_bowls_numeric', 'multiple_pro_bowls']
-                break
+    # Handle RAS score
+    if df['RAS_numeric'].notna().any():
+        df['ras_numeric'] = df['RAS_numeric']
+        measurement_cols.append('ras_numeric')
     
-    if not success_cols:
-        print("No Pro Bowl data found, cannot analyze correlations with success")
-        return
+    # Filter out columns with too many missing values
+    analysis_cols = measurement_cols + success_cols
+    valid_cols = valid_columns(df[[col for col in analysis_cols if col in df.columns]], min_fraction)
+    if len(valid_cols) <= 2:  # Need at least measurements + success metric
+        return None, measurement_cols
     
-    # Handle RAS score
-    ras_col = None
-    for col in ['ras_score', 'RAS']:
-        if col in df.columns:
-            df['ras_numeric'] = pd.to_numeric(df[col], errors='coerce')
-            ras_col = 'ras_numeric'
-            break
+    corr_df = df[valid_cols].corr()
     
-    if ras_col:
-        measurement_cols.append(ras_col)
+    # Sort columns to group similar measurements, which makes the heatmap
+    # more interpretable: measurements alphabetically, then RAS and success metrics
+    present_important = [col for col in IMPORTANT_COLUMNS if col in corr_df.columns]
+    other_cols = sorted(col for col in corr_df.columns if col not in IMPORTANT_COLUMNS)
+    new_col_order = other_cols + present_important
+    return corr_df.loc[new_col_order, new_col_order], measurement_cols
+
+def analyze_measurement_correlations(df=None):
+    print("Analyzing correlations between athletic measurements and Pro Bowl success...")
     
-    # Calculate correlations
-    analysis_cols = measurement_cols + success_cols
+    # Create output directory
+    os.makedirs('../../backend/analysis/visualizations', exist_ok=True)
+    os.makedirs('../../frontend/public/data', exist_ok=True)
     
-    # Filter out columns with too many missing values
-    valid_cols = []
-    for col in analysis_cols:
-        if col in df.columns and df[col].notna().sum() > len(df) * 0.1:  # At least 10% of values are not NA
-            valid_cols.append(col)
+    if df is None:
+        df, source = load_dataset(DATA_PATHS)
+    if df is None:
+        print("Error loading data")
+        return
+    print(f"Available columns: {list(df.columns)}")
     
-    print(f"Using {len(valid_cols)} columns for correlation analysis")
+    # Handle Pro Bowl data
+    if df['Pro_Bowls_numeric'].isna().all():
+        print("No Pro Bowl data found, cannot analyze correlations with success")
+        return
     
-    if len(valid_cols) > 2:  # Need at least measurements + success metric
-        # Calculate correlations
-        corr_df = df[valid_cols].corr()
-        
-        # Optional: Sort columns to group similar measurements
-        # This makes the heatmap more interpretable
-        try:
-            # Group metrics (RAS, pro bowls at the end)
-            important_cols = ['ras_numeric', 'pro_bowls_numeric', 'multiple_pro_bowls']
-            present_important = [col for col in important_cols if col in corr_df.columns]
-            other_cols = [col for col in corr_df.columns if col not in important_cols]
-            
-            # Sort measurement columns alphabetically 
-            other_cols.sort()
-            
-            # New column order: measurements first, then RAS and success metrics
-            new_col_order = other_cols + present_important
-            corr_df = corr_df.loc[new_col_order, new_col_order]
-        except Exception as e:
-            print(f"Error sorting correlation columns: {e}")
-        
-        # Convert correlation to serializable format
-        corr_dict = {}
-        for i, col1 in enumerate(corr_df.columns):
-            corr_dict[col1] = {}
-            for j, col2 in enumerate(corr_df.columns):
-                corr_dict[col1][col2] = corr_df.iloc[i, j]
+    corr_df, measurement_cols = correlation_matrix(df)
+    print(f"Processed {len(measurement_cols)} numeric measurement columns")
+    
+    if corr_df is not None:
+        print(f"Using {len(corr_df.columns)} columns for correlation analysis")
+        present_important = [col for col in IMPORTANT_COLUMNS if col in corr_df.columns]
         
-        # Save to JSON
-        with open('../../frontend/public/data/measurement_correlation.json', 'w') as f:
-            json.dump(corr_dict, f)
+        # Save to JSON ({column: {row: correlation}}, undefined correlations as null)
+        corr_dict = frame_nested(corr_df)
+        write_json('../../frontend/public/data/measurement_correlation.json', corr_dict)
             
         # Also save a CSV version
-        corr_df.to_csv('../../backend/analysis/visualizations/measurement_correlation.csv')
+        write_text('../../backend/analysis/visualizations/measurement_correlation.csv', corr_df.to_csv())
         
         print("Correlation data saved successfully")
         
@@ -141,22 +118,14 @@ def analyze_measurement_correlations():
         success_corr = corr_df[present_important].drop(present_important)
         
         # Save this simpler correlation data
-        success_corr.to_csv('../../backend/analysis/visualizations/success_correlation.csv')
+        write_text('../../backend/analysis/visualizations/success_correlation.csv', success_corr.to_csv())
         
-        # Create a dictionary version with cleaner keys for display
-        success_dict = {}
-        for idx, row in success_corr.iterrows():
-            # Create a cleaner display name
-            display_name = idx.replace('_numeric', '').replace('_', ' ').title()
-            
-            success_dict[display_name] = {}
-            for col in row.index:
-                # Clean up column name too
-                col_display = col.replace('_numeric', '').replace('_', ' ').title()
-                success_dict[display_name][col_display] = row[col]
+        # Create a dictionary version ({measurement: {metric: correlation}})
+        # with cleaner keys for display
+        display_names = {name: name.replace('_numeric', '').replace('_', ' ').title() for name in corr_df.columns}
+        success_dict = frame_nested(success_corr.rename(index=display_names, columns=display_names), orient='index')
         
-        with open('../../frontend/public/data/success_correlation.json', 'w') as f:
-            json.dump(success_dict, f)
+        write_json('../../frontend/public/data/success_correlation.json', success_dict)
         
         print("Success correlation data saved")
     else:
@@ -0,0 +1,233 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import warnings
+
+from ras_engine import parse_measurements, MEASUREMENT_NAMES, MIN_POSITION_SAMPLES, ALL_POSITIONS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import load_dataset, DETAILED_DATA_PATH
+from common.artifacts import write_json
+
+# Comparable players exported per player
+TOP_K = 5
+
+# Players with fewer measured values than this are left out of the index
+MIN_MEASUREMENTS = 4
+
+INDEX_PATH = '../../backend/data/player_comps_index.npz'
+COMPS_PATH = '../../frontend/public/data/player_comps.json'
+
+
+def position_stats(values, codes, n_labels, min_samples=MIN_POSITION_SAMPLES):
+    """Per-position mean and std of every measurement (last row: all positions)
+
+    Positions with fewer than min_samples values for a measurement use the
+    all-positions mean and std for it.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.full((n_labels, values.shape[1]), np.nan)
+        stds = np.full((n_labels, values.shape[1]), np.nan)
+        means[-1] = np.nanmean(values, axis=0)
+        stds[-1] = np.nanstd(values, axis=0)
+        for i in range(n_labels - 1):
+            pos_values = values[codes == i]
+            enough = np.sum(~np.isnan(pos_values), axis=0) >= min_samples
+            means[i] = np.where(enough, np.nanmean(pos_values, axis=0), means[-1])
+            stds[i] = np.where(enough, np.nanstd(pos_values, axis=0), stds[-1])
+    # Measurements nobody (or everybody equally) recorded don't separate players
+    stds[~(stds > 0)] = 1.0
+    means[np.isnan(means)] = 0.0
+    return means, stds
+
+
+def standardize(values, means, stds):
+    """z-scores with missing measurements imputed at the position mean (z = 0)"""
+    z = (values - means) / stds
+    z[np.isnan(z)] = 0.0
+    return z
+
+
+def build_comps_index(df, position_col='Position'):
+    """Standardized measurement vectors for every sufficiently measured player
+
+    Each player is standardized against their own position, so comps reflect
+    how a player compares with their position group rather than raw size.
+    """
+    measurements = parse_measurements(df)
+    values = measurements[MEASUREMENT_NAMES].to_numpy(dtype=float)
+    measured = np.sum(~np.isnan(values), axis=1)
+    keep = measured >= MIN_MEASUREMENTS
+
+    positions = df[position_col].astype('string').fillna(ALL_POSITIONS).to_numpy()
+    labels = sorted(p for p in pd.unique(positions[keep]) if p != ALL_POSITIONS) + [ALL_POSITIONS]
+    codes = pd.Categorical(positions, categories=labels).codes
+
+    values, codes = values[keep], codes[keep]
+    means, stds = position_stats(values, codes, len(labels))
+    return {
+        'positions': np.array(labels, dtype=object),
+        'means': means,
+        'stds': stds,
+        'codes': codes,
+        'vectors': standardize(values, means[codes], stds[codes]),
+        # Position-free vectors for queries without a known position
+        'pooled_vectors': standardize(values, means[-1], stds[-1]),
+        'players': df['Player'].astype('string').fillna('Unknown').to_numpy(dtype=object)[keep],
+        'rows': np.flatnonzero(keep)
+    }
+
+
+def save_comps_index(index, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **{key: value.astype(str) if value.dtype == object else value
+                                 for key, value in index.items() if not key.startswith('_')},
+                        measurements=np.array(MEASUREMENT_NAMES))
+    print(f"Saved player comps index to {path}")
+
+
+def load_comps_index(path=INDEX_PATH):
+    with np.load(path) as data:
+        if list(data['measurements']) != MEASUREMENT_NAMES:
+            raise ValueError(f"Comps index at {path} was built for different measurements, rebuild it")
+        return {key: data[key].astype(object) if data[key].dtype.kind == 'U' else data[key]
+                for key in data.files if key != 'measurements'}
+
+
+def _tree(index, code):
+    """KD-tree over one position's vectors (code -1 = all players, pooled), built on first use"""
+    from scipy.spatial import cKDTree
+
+    trees = index.setdefault('_trees', {})
+    if code not in trees:
+        if code < 0:
+            members = np.arange(len(index['codes']))
+            trees[code] = (cKDTree(index['pooled_vectors']), members)
+        else:
+            members = np.flatnonzero(index['codes'] == code)
+            trees[code] = (cKDTree(index['vectors'][members]), members)
+    return trees[code]
+
+
+def _position_code(index, position):
+    labels = list(index['positions'])
+    return labels.index(position) if position in labels[:-1] else -1
+
+
+def _neighbours(index, code, vectors, k, exclude=None):
+    """Top-k (member, distance) lists for each query vector, optionally dropping the query player"""
+    tree, members = _tree(index, code)
+    n_query = min(k + (exclude is not None), len(members))
+    if n_query == 0:
+        return [[] for _ in range(len(vectors))]
+    distances, idx = tree.query(vectors, k=n_query)
+    distances = np.asarray(distances).reshape(len(vectors), -1)
+    idx = members[np.asarray(idx).reshape(len(vectors), -1)]
+
+    results = []
+    for row in range(len(vectors)):
+        pairs = [(int(i), float(d)) for i, d in zip(idx[row], distances[row])
+                 if exclude is None or i != exclude[row]]
+        results.append(pairs[:k])
+    return results
+
+
+def query_player(index, player, k=TOP_K):
+    """Top-k comps for an indexed player (by name) as (player, position, distance) tuples"""
+    matches = np.flatnonzero(index['players'] == player)
+    if not len(matches):
+        return []
+    member = matches[0]
+    code = int(index['codes'][member])
+    pairs = _neighbours(index, code, index['vectors'][[member]], k, exclude=[member])[0]
+    return [(index['players'][i], index['positions'][index['codes'][i]], d) for i, d in pairs]
+
+
+def query_measurements(index, measurements, position=None, k=TOP_K):
+    """Top-k comps for a raw measurement set, e.g. {'40 Yard Dash': '4.45', 'Height': "6'2\""}
+
+    Keys may use any header alias the scraper sees. Without a known position
+    the prospect is compared against every player on all-positions scales.
+    """
+    values = parse_measurements(pd.DataFrame([measurements]))[MEASUREMENT_NAMES].to_numpy(dtype=float)
+    code = _position_code(index, position)
+    # Code -1 selects the all-positions row of the stats
+    vector = standardize(values, index['means'][code], index['stds'][code])
+    pairs = _neighbours(index, code, vector, k)[0]
+    return [(index['players'][i], index['positions'][index['codes'][i]], d) for i, d in pairs]
+
+
+def all_player_comps(index, k=TOP_K):
+    """Top-k comps for every indexed player, one batched tree query per position"""
+    comps = {}
+    for code in range(len(index['positions']) - 1):
+        members = np.flatnonzero(index['codes'] == code)
+        if not len(members):
+            continue
+        neighbours = _neighbours(index, code, index['vectors'][members], k, exclude=members)
+        for member, pairs in zip(members, neighbours):
+            comps[member] = pairs
+    return comps
+
+
+def export_player_comps(index, df, k=TOP_K, path=COMPS_PATH):
+    """Write {player: [comp records]} for PlayerDetails.js"""
+    ras = pd.to_numeric(df['RAS_numeric'], errors='coerce').to_numpy() if 'RAS_numeric' in df else None
+    pro_bowls = pd.to_numeric(df['Pro_Bowls_numeric'], errors='coerce').to_numpy() if 'Pro_Bowls_numeric' in df else None
+
+    export = {}
+    for member, pairs in all_player_comps(index, k).items():
+        player = index['players'][member]
+        if player in export:
+            continue
+        records = []
+        for i, distance in pairs:
+            row = index['rows'][i]
+            records.append({
+                'Player': index['players'][i],
+                'Position': index['positions'][index['codes'][i]],
+                'Distance': round(distance, 3),
+                'RAS': ras[row] if ras is not None else None,
+                'Pro_Bowls': pro_bowls[row] if pro_bowls is not None else None
+            })
+        export[player] = records
+
+    write_json(path, {'k': k, 'players': export}, precision=2)
+    print(f"Saved comps for {len(export)} players to {path}")
+
+
+def build_player_comps(k=TOP_K):
+    print("Building the similar-player index...")
+
+    df, source = load_dataset([DETAILED_DATA_PATH])
+    if df is None:
+        print("Detailed data not found. Run collect_data.py to scrape profile measurements.")
+        return
+
+    start = time.perf_counter()
+    index = build_comps_index(df)
+    print(f"Indexed {len(index['players'])} players with at least {MIN_MEASUREMENTS} measurements "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if not len(index['players']):
+        print("No players have enough measurements for comps")
+        return
+
+    save_comps_index(index)
+
+    start = time.perf_counter()
+    export_player_comps(index, df, k)
+    print(f"Computed all comps in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Single-query latency once the trees are built
+    sample = index['players'][:min(100, len(index['players']))]
+    start = time.perf_counter()
+    for player in sample:
+        query_player(index, player, k)
+    print(f"Average comps query: {(time.perf_counter() - start) / len(sample) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    build_player_comps()
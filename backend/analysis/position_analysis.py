@@ -1,82 +1,74 @@
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+import sys
 
-def analyze_positions():
-    print("Performing position-specific analysis...")
-    
-    # Create output directory
-    os.makedirs('../../backend/analysis/visualizations/positions', exist_ok=True)
-    
-    # Load the data
-    try:
-        df = pd.read_csv('../../backend/data/pro_bowlers_ras.csv')
-        print(f"Loaded data for {len(df)} players")
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return
-    
-    # Convert RAS to numeric
-    if 'RAS' in df.columns:
-        df['RAS_numeric'] = pd.to_numeric(df['RAS'], errors='coerce')
-    
-    # Convert Pro Bowls to numeric
-    pro_bowl_cols = ['Pro Bowls', 'ProBowls', 'Pro_Bowls']
-    for col in pro_bowl_cols:
-        if col in df.columns:
-            df['Pro_Bowl_Count'] = pd.to_numeric(df[col], errors='coerce')
-            break
-    
-    # Handle position
-    pos_col = None
-    for col in ['Position', 'Pos']:
-        if col in df.columns:
-            pos_col = col
-            break
-    
-    if not pos_col:
-        print("No position column found")
-        return
-    
-    # Filter out DB position as requested earlier
-    df = df[df[pos_col] != 'DB']
-    
-    # Get unique positions
-    positions = df[pos_col].unique()
-    print(f"Analyzing {len(positions)} positions: {positions}")
-    
-    # Create position summary data
+from chart_data import build_chart_data, position_slice, CHARTS_PATH, HIST_EDGES, RAS_GRID, MIN_PLAYERS
+from position_pooling import pooled_position_estimates
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import load_dataset, BASIC_DATA_PATH, PRO_BOWL_THRESHOLD
+from common.artifacts import write_frame_json, write_json, render_cached, data_key
+
+# Source files this stage reads, in order of preference
+DATA_PATHS = [BASIC_DATA_PATH]
+
+# position_stats.json lists every position with at least this many players;
+# positions under MIN_PLAYERS are flagged as small samples rather than dropped
+SUMMARY_MIN_PLAYERS = 1
+
+POSITION_FIGURES_DIR = '../../backend/analysis/visualizations/positions'
+
+def render_position_figures(chart_data, df, pos_col):
+    """Per-position PNGs drawn from the chart data; positions whose data is unchanged are skipped"""
+    # The figure stack is only imported when figures are actually rendered
+    import matplotlib.pyplot as plt
+
+    rendered = 0
+    bin_width = HIST_EDGES[1] - HIST_EDGES[0]
+    for position in chart_data['positions'][:-1]:
+        data = position_slice(chart_data, position)
+        pos_data = df.loc[df[pos_col] == position, ['RAS_numeric', 'Pro_Bowls_numeric']]
+
+        def draw_distribution():
+            plt.figure(figsize=(10, 6))
+            plt.bar(HIST_EDGES[:-1], data['histogram'], width=bin_width, align='edge', alpha=0.5, edgecolor='black')
+            # KDE scaled from a density to counts per bin
+            plt.plot(RAS_GRID, data['kde'] * data['histogram'].sum() * bin_width)
+            plt.title(f'RAS Distribution for {position}')
+            plt.xlabel('Relative Athletic Score (RAS)')
+            plt.ylabel('Count')
+
+        def draw_regression():
+            plt.figure(figsize=(10, 6))
+            plt.scatter(pos_data['RAS_numeric'], pos_data['Pro_Bowls_numeric'], alpha=0.5)
+            plt.plot(RAS_GRID, data['regression_fit'])
+            plt.fill_between(RAS_GRID, data['regression_lower'], data['regression_upper'], alpha=0.15)
+            plt.title(f'RAS vs Pro Bowl Selections for {position}')
+            plt.xlabel('Relative Athletic Score (RAS)')
+            plt.ylabel('Pro Bowl Selections')
+
+        rendered += render_cached(f'{POSITION_FIGURES_DIR}/{position}_ras_distribution.png',
+                                  data_key('ras_distribution', position, data['histogram'], data['kde']),
+                                  draw_distribution)
+        rendered += render_cached(f'{POSITION_FIGURES_DIR}/{position}_ras_vs_probowls.png',
+                                  data_key('ras_vs_probowls', position, pos_data, data['regression_fit'],
+                                           data['regression_lower'], data['regression_upper']),
+                                  draw_regression)
+    print(f"Rendered {rendered} position figures ({2 * (len(chart_data['positions']) - 1) - rendered} unchanged)")
+
+def position_summary(df, pos_col='Position', min_players=MIN_PLAYERS, threshold=PRO_BOWL_THRESHOLD):
+    """Player count, average RAS and Pro Bowl rates of every position with at least min_players players"""
     position_stats = []
-    for position in positions:
+    for position in df[pos_col].unique():
         pos_data = df[df[pos_col] == position]
         
-        if len(pos_data) < 3:  # Skip positions with too few players
+        if len(pos_data) < min_players:  # Skip positions with too few players
             continue
             
         avg_ras = pos_data['RAS_numeric'].mean()
-        avg_pro_bowls = pos_data['Pro_Bowl_Count'].mean()
-        total_pro_bowls = pos_data['Pro_Bowl_Count'].sum()
-        multi_pb_rate = (pos_data['Pro_Bowl_Count'] > 1).mean() * 100
-        
-        # RAS distribution visualization
-        plt.figure(figsize=(10, 6))
-        sns.histplot(pos_data['RAS_numeric'].dropna(), bins=10, kde=True)
-        plt.title(f'RAS Distribution for {position}')
-        plt.xlabel('Relative Athletic Score (RAS)')
-        plt.ylabel('Count')
-        plt.savefig(f'../../backend/analysis/visualizations/positions/{position}_ras_distribution.png')
-        plt.close()
-        
-        # RAS vs Pro Bowls scatter plot
-        plt.figure(figsize=(10, 6))
-        sns.regplot(x='RAS_numeric', y='Pro_Bowl_Count', data=pos_data, scatter_kws={'alpha':0.5})
-        plt.title(f'RAS vs Pro Bowl Selections for {position}')
-        plt.xlabel('Relative Athletic Score (RAS)')
-        plt.ylabel('Pro Bowl Selections')
-        plt.savefig(f'../../backend/analysis/visualizations/positions/{position}_ras_vs_probowls.png')
-        plt.close()
+        avg_pro_bowls = pos_data['Pro_Bowls_numeric'].mean()
+        total_pro_bowls = pos_data['Pro_Bowls_numeric'].sum()
+        multi_pb_rate = (pos_data['Pro_Bowls_numeric'] > threshold).mean() * 100
         
         # Add to position stats
         position_stats.append({
@@ -88,32 +80,77 @@ def analyze_positions():
             'MultiProBowlRate': multi_pb_rate
         })
     
-    # Create position summary dataframe
-    position_df = pd.DataFrame(position_stats)
+    return pd.DataFrame(position_stats)
+
+def analyze_positions(figures=True, df=None):
+    print("Performing position-specific analysis...")
+    
+    # Create output directory
+    os.makedirs(POSITION_FIGURES_DIR, exist_ok=True)
+    
+    # Load the data
+    if df is None:
+        df, source = load_dataset(DATA_PATHS)
+    if df is None:
+        print("Error loading data")
+        return
+    pos_col = 'Position'
+    
+    # Filter out DB position as requested earlier
+    df = df[df[pos_col] != 'DB']
+    
+    # Get unique positions
+    positions = list(df[pos_col].unique())
+    print(f"Analyzing {len(positions)} positions: {positions}")
+    
+    # Raw summary of every position (small ones included and flagged) next
+    # to estimates shrunk toward the position's group, with their bands
+    pooled = pooled_position_estimates(df, pos_col)
+    position_df = position_summary(df, pos_col, SUMMARY_MIN_PLAYERS).merge(pooled, on='Position', how='left')
+    print(f"Pooled position estimates ({position_df['SmallSample'].sum()} positions under {MIN_PLAYERS} players), "
+          f"between-position variance: " + ", ".join(f"{name} {tau2:.4g}" for name, tau2 in pooled.attrs['tau2'].items()))
     
     # Save for frontend
-    position_df.to_json('../../frontend/public/data/position_stats.json', orient='records')
+    write_frame_json('../../frontend/public/data/position_stats.json', position_df, orient='records')
     print("Position-specific analysis complete and saved")
     
+    # Histograms, KDE curves and regression bands for client-side charts,
+    # computed for all positions at once
+    chart_data = build_chart_data(df, pos_col)
+    write_json(CHARTS_PATH, chart_data, precision=4)
+    print(f"Saved chart data for {len(chart_data['positions'])} groups to {CHARTS_PATH}")
+    
+    if not figures:
+        return
+    
+    import matplotlib.pyplot as plt
+    
+    render_position_figures(chart_data, df, pos_col)
+    
+    def draw_pooled_bars(name, title):
+        # Pooled estimates with their bands; hatched bars are small samples
+        data = position_df.sort_values(f'Pooled{name}', ascending=False)
+        estimate = data[f'Pooled{name}']
+        errors = [estimate - data[f'Pooled{name}_Lower'], data[f'Pooled{name}_Upper'] - estimate]
+        plt.figure(figsize=(12, 8))
+        plt.bar(data['Position'], estimate, yerr=errors, capsize=4,
+                hatch=['//' if small else '' for small in data['SmallSample']])
+        plt.title(title)
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+    
     # Create position comparison chart
-    plt.figure(figsize=(12, 8))
-    chart_data = position_df.sort_values('AvgRAS', ascending=False)
-    sns.barplot(x='Position', y='AvgRAS', data=chart_data)
-    plt.title('Average RAS by Position')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('../../backend/analysis/visualizations/position_ras_comparison.png')
-    plt.close()
+    ras_columns = ['Position', 'SmallSample', 'PooledAvgRAS', 'PooledAvgRAS_Lower', 'PooledAvgRAS_Upper']
+    render_cached('../../backend/analysis/visualizations/position_ras_comparison.png',
+                  data_key('ras_comparison', position_df[ras_columns]),
+                  lambda: draw_pooled_bars('AvgRAS', 'Average RAS by Position (pooled by position group)'))
     
     # Create multi-Pro Bowl rate comparison
-    plt.figure(figsize=(12, 8))
-    chart_data = position_df.sort_values('MultiProBowlRate', ascending=False)
-    sns.barplot(x='Position', y='MultiProBowlRate', data=chart_data)
-    plt.title('Multiple Pro Bowl Rate by Position (%)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('../../backend/analysis/visualizations/position_probowl_rate.png')
-    plt.close()
+    rate_columns = ['Position', 'SmallSample', 'PooledMultiProBowlRate',
+                    'PooledMultiProBowlRate_Lower', 'PooledMultiProBowlRate_Upper']
+    render_cached('../../backend/analysis/visualizations/position_probowl_rate.png',
+                  data_key('probowl_rate', position_df[rate_columns]),
+                  lambda: draw_pooled_bars('MultiProBowlRate', 'Multiple Pro Bowl Rate by Position (%, pooled by position group)'))
 
 if __name__ == "__main__":
     analyze_positions()
\ No newline at end of file
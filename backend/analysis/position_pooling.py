@@ -0,0 +1,194 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import warnings
+from statistics import NormalDist
+
+from chart_data import grouped_moments, position_codes, MIN_PLAYERS, CI_LEVEL, POOLED_LABEL
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import PRO_BOWL_THRESHOLD
+
+# Positions are shrunk toward the estimate of their position group; the
+# spellings the RAS tables use for the same group are listed together
+POSITION_GROUPS = {
+    'OL': ['OT', 'OG', 'OC', 'OL', 'T', 'G', 'C'],
+    'DL': ['DE', 'DT', 'DL', 'NT', 'EDGE'],
+    'DB': ['CB', 'FS', 'SS', 'S', 'DB'],
+    'LB': ['LB', 'ILB', 'OLB', 'MLB'],
+    'skill': ['QB', 'RB', 'WR', 'TE', 'FB', 'HB'],
+}
+
+# A group with fewer positions (that have an estimate) than this has nothing
+# to pool across, so its positions shrink toward the all-positions estimate
+# instead, as do positions outside every group
+MIN_GROUP_POSITIONS = 2
+
+
+def position_groups(labels, groups=POSITION_GROUPS):
+    """Group names and each label's group code (-1 = no group)"""
+    names = list(groups)
+    lookup = {position: i for i, name in enumerate(names) for position in groups[name]}
+    return names, pd.Series(labels, dtype=object).map(lookup).fillna(-1).astype(int).to_numpy()
+
+
+def shrink(estimate, variance, groups, n_groups, min_positions=MIN_GROUP_POSITIONS, tau2=None):
+    """Normal-normal empirical-Bayes shrinkage of per-position estimates toward their group
+
+    estimate and variance are each position's raw estimate and its sampling
+    variance (NaN or infinite when the position has no usable estimate).
+    The between-position variance tau2 is the DerSimonian-Laird moment
+    estimate around the group means, shared by all groups (unless given);
+    group priors are then the precision-weighted means under
+    1 / (variance + tau2). Each position moves toward its prior by
+    B = variance / (variance + tau2), and positions without an estimate get
+    the prior itself with variance tau2 + var(prior). Everything is one pass
+    of bincounts. slot is the prior each position used: its group code, or
+    n_groups for the all-positions prior.
+
+    With tau2 = 0 every position collapses to its prior; the third position
+    is alone in its group, so its prior is the all-positions one:
+
+    >>> estimate, variance = np.array([1.0, 3.0, 8.0]), np.ones(3)
+    >>> groups = np.array([0, 0, 1])
+    >>> fit = shrink(estimate, variance, groups, n_groups=2, tau2=0.0)
+    >>> fit['slot'].tolist()
+    [0, 0, 2]
+    >>> bool(np.allclose(fit['estimate'], [2.0, 2.0, 4.0]))
+    True
+
+    With a huge tau2 positions keep their raw values:
+
+    >>> fit = shrink(estimate, variance, groups, n_groups=2, tau2=1e12)
+    >>> bool(np.allclose(fit['estimate'], estimate))
+    True
+
+    A position without an estimate gets its prior:
+
+    >>> fit = shrink(np.array([1.0, 3.0, np.nan]), variance, np.array([0, 0, 0]), n_groups=1, tau2=0.0)
+    >>> bool(np.allclose(fit['estimate'], 2.0)), float(fit['shrinkage'][2])
+    (True, 1.0)
+    """
+    observed = np.isfinite(estimate) & np.isfinite(variance) & (variance > 0)
+    y = np.where(observed, estimate, 0.0)
+    v = np.where(observed, variance, np.inf)
+
+    # Slot per position: its group, or the all-positions slot (n_groups)
+    counts = np.bincount(groups[observed & (groups >= 0)], minlength=n_groups)
+    slot = np.where((groups >= 0) & (counts[np.maximum(groups, 0)] >= min_positions), groups, n_groups)
+    n_slots = n_groups + 1
+
+    w = np.where(observed, 1 / v, 0.0)
+    sw = np.bincount(slot, w, minlength=n_slots)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fixed_mean = np.bincount(slot, w * y, minlength=n_slots) / sw
+        q = np.sum(w * (y - np.nan_to_num(fixed_mean[slot])) ** 2)
+        used = np.bincount(slot[observed], minlength=n_slots) > 0
+        df = observed.sum() - used.sum()
+        denominator = w.sum() - np.sum(np.bincount(slot, w * w, minlength=n_slots)[used] / sw[used])
+        if tau2 is None:
+            tau2 = max(0.0, (q - df) / denominator) if denominator > 0 else 0.0
+
+        w_re = np.where(observed, 1 / (v + tau2), 0.0)
+        sw_re = np.bincount(slot, w_re, minlength=n_slots)
+        prior = np.bincount(slot, w_re * y, minlength=n_slots) / sw_re
+        prior_var = 1 / sw_re
+        # The all-positions prior pools every position, not just the ones assigned to it
+        prior[n_groups] = np.sum(w_re * y) / np.sum(w_re)
+        prior_var[n_groups] = 1 / np.sum(w_re)
+
+        shrinkage = np.where(observed, v / (v + tau2), 1.0)
+        # Unobserved positions (infinite v) are computed too and replaced by the prior
+        m, m_var = prior[slot], prior_var[slot]
+        posterior = np.where(observed, m + (1 - shrinkage) * (y - m), m)
+        posterior_var = np.where(observed, (1 - shrinkage) * v + shrinkage ** 2 * m_var, tau2 + m_var)
+    return {
+        'slot': slot,
+        'prior': m,
+        'tau2': tau2,
+        'shrinkage': shrinkage,
+        'estimate': posterior,
+        'se': np.sqrt(posterior_var)
+    }
+
+
+def pooled_position_estimates(df, pos_col='Position', threshold=PRO_BOWL_THRESHOLD, level=CI_LEVEL, groups=POSITION_GROUPS):
+    """Shrunken average RAS, multi-Pro Bowl rate and RAS -> Pro Bowls slope of every position
+
+    Raw estimates and their sampling variances come from grouped moments:
+    the RAS mean with the pooled within-position variance, the rate with the
+    (smoothed) rate of its group, and the OLS slope with the pooled residual
+    variance, so positions with one or two players still get a variance.
+    The <estimate>_Group columns name what each estimate was pooled toward:
+
+    >>> df = pd.DataFrame({'Position': ['QB', 'QB', 'RB', 'RB', 'DE', 'DE'],
+    ...                    'RAS_numeric': [9.1, 7.5, 6.2, 8.8, 9.5, 4.0],
+    ...                    'Pro_Bowls_numeric': [3, 1, 2, 5, 4, 1]})
+    >>> pooled_position_estimates(df)[['Position', 'AvgRAS_Group']].values.tolist()
+    [['DE', 'All'], ['QB', 'skill'], ['RB', 'skill']]
+    """
+    labels, codes = position_codes(df[pos_col].astype('string').fillna('Unknown'), min_players=1)
+    group_names, group_codes = position_groups(labels, groups)
+    n_positions, n_groups = len(labels), len(group_names)
+    x = df['RAS_numeric'].to_numpy(dtype=float)
+    pro_bowls = df['Pro_Bowls_numeric'].to_numpy(dtype=float)
+    hit = np.where(np.isnan(pro_bowls), np.nan, (pro_bowls > threshold).astype(float))
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        ras = grouped_moments(codes, n_positions, x)
+        within_ss = ras['sxx'] - ras['sx'] ** 2 / ras['n']
+        pooled_var = np.nansum(within_ss) / (ras['n'].sum() - np.sum(ras['n'] > 0))
+        ras_mean = ras['sx'] / ras['n']
+        ras_fit = shrink(ras_mean, pooled_var / ras['n'], group_codes, n_groups)
+
+        rate = grouped_moments(codes, n_positions, hit)
+        raw_rate = rate['sx'] / rate['n']
+        # Rates of 0 or 1 have no binomial variance of their own: use the
+        # group's rate, smoothed away from 0 and 1
+        slot = np.where(group_codes >= 0, group_codes, n_groups)
+        hits = np.bincount(slot, rate['sx'], minlength=n_groups + 1)
+        trials = np.bincount(slot, rate['n'], minlength=n_groups + 1)
+        hits[n_groups], trials[n_groups] = rate['sx'].sum(), rate['n'].sum()
+        smoothed = (hits + 0.5) / (trials + 1)
+        rate_fit = shrink(raw_rate, smoothed[slot] * (1 - smoothed[slot]) / rate['n'], group_codes, n_groups)
+
+        reg = grouped_moments(codes, n_positions, x, pro_bowls)
+        n = reg['n']
+        sxx = reg['sxx'] - reg['sx'] ** 2 / n
+        sxy = reg['sxy'] - reg['sx'] * reg['sy'] / n
+        syy = reg['syy'] - reg['sy'] ** 2 / n
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        residual = np.where(n > 2, np.maximum(syy - slope * sxy, 0), np.nan)
+        residual_var = np.nansum(residual) / np.sum(np.where(n > 2, n - 2, 0))
+        slope_fit = shrink(slope, residual_var / sxx, group_codes, n_groups)
+
+    # The thresholds go out with the estimates so the frontend can describe them
+    result = pd.DataFrame({
+        'Position': labels,
+        'SmallSample': ras['n'] < MIN_PLAYERS,
+        'MinPlayers': MIN_PLAYERS,
+        'CILevel': level,
+        'RASSlope': slope,
+    })
+    for name, fit, low, high, scale in [('AvgRAS', ras_fit, 0, 10, 1),
+                                        ('MultiProBowlRate', rate_fit, 0, 1, 100),
+                                        ('RASSlope', slope_fit, -np.inf, np.inf, 1)]:
+        result[f"Pooled{name}"] = fit['estimate'] * scale
+        result[f"Pooled{name}_Lower"] = np.clip(fit['estimate'] - z * fit['se'], low, high) * scale
+        result[f"Pooled{name}_Upper"] = np.clip(fit['estimate'] + z * fit['se'], low, high) * scale
+        result[f"{name}_Shrinkage"] = fit['shrinkage']
+        # What the estimate was actually pooled toward: the position's group,
+        # or every position when the group had too few to pool across
+        result[f"{name}_Group"] = np.array(group_names + [POOLED_LABEL], dtype=object)[fit['slot']]
+    result.attrs['tau2'] = {'AvgRAS': ras_fit['tau2'], 'MultiProBowlRate': rate_fit['tau2'] * 100 ** 2,
+                            'RASSlope': slope_fit['tau2']}
+    return result
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,215 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# The measurements and their header aliases are shared with the data quality checks
+from common.measurements import MEASUREMENTS, MEASUREMENT_NAMES, resolve_measurement_columns, parse_number
+
+# Measurements recorded as feet and inches on the profile pages
+FEET_INCH_MEASUREMENTS = ['height', 'broad']
+
+# Like ras.football, a composite score needs at least this many scored components
+MIN_COMPONENTS = 6
+
+# Positions with fewer historical values than this for a measurement are
+# scored against the all-positions distribution instead
+MIN_POSITION_SAMPLES = 5
+
+# Resolution of the percentile lookup tables (0th..100th percentile)
+N_QUANTILES = 101
+
+ALL_POSITIONS = 'ALL'
+
+TABLES_PATH = '../../backend/data/ras_position_tables.npz'
+
+
+def _parse_feet_inches(values):
+    """Parse heights/broad jumps such as 6'2", 6' 2 1/8", 6-2, 6021 or 74.25 into inches"""
+    text = values.astype('string').str.strip()
+
+    # 6'2", 6' 2 1/8", 10'3"
+    ft_in = text.str.extract(r"^(?P<ft>\d+)\s*'\s*(?P<inch>\d+(?:\.\d+)?)?(?:\s+(?P<num>\d)/(?P<den>\d))?")
+    inches = (ft_in['ft'].astype(float) * 12
+              + ft_in['inch'].astype(float).fillna(0)
+              + (ft_in['num'].astype(float) / ft_in['den'].astype(float)).fillna(0))
+
+    # 6-2
+    dashed = text.str.extract(r'^(?P<ft>\d)-(?P<inch>\d{1,2})$').astype(float)
+    inches = inches.fillna(dashed['ft'] * 12 + dashed['inch'])
+
+    # 6021 -> 6 feet, 02 inches, 1 eighth (scouting notation)
+    scouting = text.str.extract(r'^(?P<ft>\d)(?P<inch>\d{2})(?P<eighth>\d)$').astype(float)
+    inches = inches.fillna(scouting['ft'] * 12 + scouting['inch'] + scouting['eighth'] / 8)
+
+    # Plain number, already in inches
+    plain = pd.to_numeric(text.str.extract(r'^(\d+(?:\.\d+)?)\s*(?:in|")?$')[0], errors='coerce')
+    return inches.fillna(plain).astype(float)
+
+
+def parse_measurements(df):
+    """Convert the scraped measurement columns into a float frame in canonical units"""
+    resolved = resolve_measurement_columns(df.columns)
+    parsed = pd.DataFrame(index=df.index, columns=MEASUREMENT_NAMES, dtype=float)
+    for name, col in resolved.items():
+        if name in FEET_INCH_MEASUREMENTS and not pd.api.types.is_numeric_dtype(df[col]):
+            parsed[name] = _parse_feet_inches(df[col])
+        else:
+            parsed[name] = parse_number(df[col])
+    return parsed
+
+
+def build_position_tables(measurements, positions, n_quantiles=N_QUANTILES, min_samples=MIN_POSITION_SAMPLES):
+    """Precompute per-position percentile lookup tables from historical measurements
+
+    Returns a dict with the position labels (the last one is the all-positions
+    fallback) and a (positions, measurements, quantiles) array of sorted cut
+    points.
+    """
+    positions = pd.Series(positions, index=measurements.index).astype('string').fillna(ALL_POSITIONS)
+    values = measurements[MEASUREMENT_NAMES].to_numpy(dtype=float)
+    probs = np.linspace(0, 1, n_quantiles)
+
+    labels = sorted(p for p in positions.unique() if p != ALL_POSITIONS) + [ALL_POSITIONS]
+    tables = np.full((len(labels), len(MEASUREMENT_NAMES), n_quantiles), np.nan)
+
+    # Pooled distribution first so sparse positions can fall back to it
+    counts = np.sum(~np.isnan(values), axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        pooled = np.nanquantile(values, probs, axis=0).T if len(values) else tables[-1]
+    tables[-1] = np.where((counts >= 1)[:, None], pooled, np.nan)
+
+    codes = pd.Categorical(positions, categories=labels).codes
+    for i in range(len(labels) - 1):
+        pos_values = values[codes == i]
+        pos_counts = np.sum(~np.isnan(pos_values), axis=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            pos_quantiles = np.nanquantile(pos_values, probs, axis=0).T
+        tables[i] = np.where((pos_counts >= min_samples)[:, None], pos_quantiles, tables[-1])
+
+    return {'positions': np.array(labels, dtype=object), 'tables': tables}
+
+
+def save_position_tables(tables, path=TABLES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, positions=tables['positions'].astype(str), tables=tables['tables'],
+                        measurements=np.array(MEASUREMENT_NAMES))
+    print(f"Saved RAS position tables to {path}")
+
+
+def load_position_tables(path=TABLES_PATH):
+    with np.load(path) as data:
+        if list(data['measurements']) != MEASUREMENT_NAMES:
+            raise ValueError(f"RAS tables at {path} were built for different measurements, rebuild them")
+        return {'positions': data['positions'].astype(object), 'tables': data['tables']}
+
+
+def _percentiles(cut_points, groups, x):
+    """Percentile of each x within its position's row of sorted cut points
+
+    groups maps a row of cut_points to the indices of the players it scores,
+    so each position is a single vectorized interpolation.
+    """
+    probs = np.linspace(0, 1, cut_points.shape[1])
+    pct = np.full(len(x), np.nan)
+    for row, idx in groups.items():
+        if np.isnan(cut_points[row, 0]):
+            continue
+        # np.interp pins values outside the historical range to 0 / 1
+        pct[idx] = np.interp(x[idx], cut_points[row], probs)
+    pct[np.isnan(x)] = np.nan
+    return pct
+
+
+def score_measurements(tables, measurements, positions, min_components=MIN_COMPONENTS):
+    """Score every player's measurements 0-10 against their position's history
+
+    Returns a frame with one <measurement>_score column per component plus the
+    composite RAS_computed (NaN when fewer than min_components were scored).
+    """
+    labels = list(tables['positions'])
+    codes = pd.Categorical(pd.Series(positions, index=measurements.index).astype('string'),
+                           categories=labels).codes
+    codes = np.where(codes < 0, len(labels) - 1, codes)
+
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+    groups = {row: order[bounds[row]:bounds[row + 1]] for row in range(len(labels)) if bounds[row] < bounds[row + 1]}
+
+    values = measurements[MEASUREMENT_NAMES].to_numpy(dtype=float)
+    scores = np.empty_like(values)
+    for j, name in enumerate(MEASUREMENT_NAMES):
+        pct = _percentiles(tables['tables'][:, j, :], groups, values[:, j])
+        if MEASUREMENTS[name]['lower_is_better']:
+            pct = 1 - pct
+        scores[:, j] = pct * 10
+
+    n_scored = np.sum(~np.isnan(scores), axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        composite = np.where(n_scored >= min_components, np.nanmean(scores, axis=1), np.nan)
+
+    result = pd.DataFrame(scores, index=measurements.index,
+                          columns=[f"{name}_score" for name in MEASUREMENT_NAMES])
+    result['RAS_components'] = n_scored
+    result['RAS_computed'] = np.round(composite, 2)
+    return result
+
+
+def rescore_players(df, tables=None, position_col='Position'):
+    """Parse, (optionally) build tables for, and score a frame of scraped players"""
+    measurements = parse_measurements(df)
+    if tables is None:
+        tables = build_position_tables(measurements, df[position_col])
+    return score_measurements(tables, measurements, df[position_col]), tables
+
+
+def recompute_ras():
+    print("Recomputing RAS from raw combine measurements...")
+
+    try:
+        df = pd.read_csv('../../backend/data/pro_bowlers_ras_detailed.csv')
+        print(f"Loaded detailed data for {len(df)} players")
+    except Exception as e:
+        print(f"Error loading detailed data: {e}")
+        return
+
+    position_col = 'Position' if 'Position' in df.columns else 'Pos'
+    resolved = resolve_measurement_columns(df.columns)
+    print(f"Found {len(resolved)} measurement columns: {resolved}")
+    if not resolved:
+        print("No measurement columns found. Run collect_data.py to scrape profile measurements.")
+        return
+
+    measurements = parse_measurements(df)
+
+    start = time.perf_counter()
+    tables = build_position_tables(measurements, df[position_col])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_measurements(tables, measurements, df[position_col])
+    score_time = time.perf_counter() - start
+
+    print(f"Built lookup tables for {len(tables['positions'])} positions in {build_time * 1000:.1f} ms")
+    print(f"Scored {len(df)} players in {score_time * 1000:.1f} ms")
+
+    if 'RAS' in df.columns:
+        scraped = pd.to_numeric(df['RAS'], errors='coerce')
+        agreement = scraped.corr(scores['RAS_computed'])
+        print(f"Correlation with scraped RAS: {agreement:.4f}")
+
+    save_position_tables(tables)
+
+    output = pd.concat([df[[col for col in ['Player', position_col, 'RAS'] if col in df.columns]], scores], axis=1)
+    output.to_csv('../../backend/data/ras_recomputed.csv', index=False)
+    print("Saved recomputed scores to backend/data/ras_recomputed.csv")
+
+
+if __name__ == "__main__":
+    recompute_ras()
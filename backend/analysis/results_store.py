@@ -0,0 +1,179 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import io
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.artifacts import write_json, write_bytes, write_text
+from common.serialize import frame_records
+
+# Analysis runs record their result tables in long format: one row per (run,
+# stage, model, table, row, column) cell. Every append writes a new part file
+# (<run_id>_<part>.parquet) into RESULTS_DIR, so recording a run never reads
+# or rewrites earlier runs; the directory is read back as one dataset.
+# Without pyarrow the parts are stored as CSV.
+RESULTS_DIR = '../../backend/analysis/results'
+try:
+    import pyarrow  # noqa: F401
+    RESULTS_FORMAT = 'parquet'
+except ImportError:
+    RESULTS_FORMAT = 'csv'
+
+RESULT_COLUMNS = ['run_id', 'run_at', 'stage', 'model', 'table', 'row', 'column', 'value']
+
+FRONTEND_RESULTS_PATH = '../../frontend/public/data/model_results.json'
+
+
+def new_run_id():
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def tidy_table(table, stage, model, name):
+    """Melt a wide table (index = rows, columns = statistics) into result rows"""
+    long = table.rename_axis('row').reset_index().melt(id_vars='row', var_name='column', value_name='cell')
+    long = long.rename(columns={'cell': 'value'})
+    long['row'] = long['row'].astype(str)
+    long['column'] = long['column'].astype(str)
+    long['value'] = pd.to_numeric(long['value'], errors='coerce').astype(float)
+    long['stage'] = stage
+    long['model'] = model
+    long['table'] = name
+    return long
+
+
+def regression_tables(model):
+    """Coefficient and fit-statistic tables for a fitted statsmodels regression"""
+    ci = model.conf_int()
+    coefficients = pd.DataFrame({
+        'coef': model.params,
+        'std_err': model.bse,
+        'statistic': model.tvalues,
+        'p_value': model.pvalues,
+        'ci_lower': ci[0],
+        'ci_upper': ci[1]
+    })
+
+    fit = {'nobs': model.nobs}
+    for stat in ['rsquared', 'rsquared_adj', 'fvalue', 'f_pvalue', 'aic', 'bic', 'llf', 'deviance']:
+        value = getattr(model, stat, None)
+        if value is not None:
+            fit[stat] = value
+    fit_stats = pd.DataFrame({'value': pd.Series(fit, dtype=float)})
+    return {'coefficients': coefficients, 'fit': fit_stats}
+
+
+def classification_tables(y_true, y_pred, feature_importance=None):
+    """Metric, per-class report and confusion-matrix tables for a classifier"""
+    from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+    labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+    report = classification_report(y_true, y_pred, labels=labels, output_dict=True, zero_division=0)
+    per_class = pd.DataFrame({k: v for k, v in report.items() if isinstance(v, dict)}).T
+
+    matrix = pd.DataFrame(confusion_matrix(y_true, y_pred, labels=labels),
+                          index=[f"actual_{label}" for label in labels],
+                          columns=[f"predicted_{label}" for label in labels])
+
+    tables = {
+        'metrics': pd.DataFrame({'value': {'accuracy': accuracy_score(y_true, y_pred), 'support': len(y_true)}}),
+        'classification_report': per_class,
+        'confusion_matrix': matrix
+    }
+    if feature_importance is not None:
+        tables['feature_importance'] = feature_importance.set_index('Feature')[['Importance']]
+    return tables
+
+
+def result_rows(tables, stage, model, run_id):
+    """Result rows for one model's tables ({name: wide DataFrame})"""
+    frames = [tidy_table(table, stage, model, name) for name, table in tables.items()]
+    rows = pd.concat(frames, ignore_index=True)
+    rows['run_id'] = run_id
+    rows['run_at'] = run_id.split('-')[0]
+    return rows[RESULT_COLUMNS]
+
+
+def append_rows(rows, directory=RESULTS_DIR):
+    """Record result rows as a new part file (written atomically); returns its path"""
+    os.makedirs(directory, exist_ok=True)
+    # Parts are named after their run so a single run can be read on its own
+    run_id = rows['run_id'].iloc[0] if len(rows) else new_run_id()
+    path = os.path.join(directory, f"{run_id}_{uuid.uuid4().hex[:8]}.{RESULTS_FORMAT}")
+    if RESULTS_FORMAT == 'parquet':
+        buffer = io.BytesIO()
+        rows.to_parquet(buffer, index=False)
+        write_bytes(path, buffer.getvalue(), manifest=False)
+    else:
+        write_text(path, rows.to_csv(index=False), manifest=False)
+    return path
+
+
+def append_results(tables, stage, model, run_id, directory=RESULTS_DIR):
+    """Record a model's result tables ({name: wide DataFrame})"""
+    return append_rows(result_rows(tables, stage, model, run_id), directory)
+
+
+def _read_part(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={'row': str, 'column': str, 'run_id': str, 'run_at': str})
+
+
+def load_results(directory=RESULTS_DIR, **filters):
+    """Load result rows, optionally filtered by column value (e.g. stage='advanced_analytics')
+
+    Filtering by run_id only reads that run's part files.
+    """
+    if not os.path.isdir(directory):
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    names = sorted(name for name in os.listdir(directory)
+                   if name.endswith(('.parquet', '.csv')) and not name.startswith('.'))
+    if 'run_id' in filters:
+        names = [name for name in names if name.startswith(f"{filters['run_id']}_")]
+    if not names:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    results = pd.concat([_read_part(os.path.join(directory, name)) for name in names], ignore_index=True)
+
+    for column, value in filters.items():
+        results = results[results[column] == value]
+    return results
+
+
+def result_table(results, model, table, run_id=None):
+    """Pivot one model's table back to wide form (latest run unless run_id is given)"""
+    rows = results[(results['model'] == model) & (results['table'] == table)]
+    if rows.empty:
+        return pd.DataFrame()
+    run_id = run_id or rows['run_id'].max()
+    rows = rows[rows['run_id'] == run_id]
+    wide = rows.pivot(index='row', columns='column', values='value')
+    # Keep the order the rows and columns were recorded in
+    return wide.loc[rows['row'].unique(), rows['column'].unique()].rename_axis(index=None, columns=None)
+
+
+def render_text(results, model, run_id=None):
+    """Plain-text rendering of a model's recorded tables, for the optional .txt summaries"""
+    run_id = run_id or results.loc[results['model'] == model, 'run_id'].max()
+    sections = [f"{model} (run {run_id})"]
+    for table in results.loc[(results['model'] == model) & (results['run_id'] == run_id), 'table'].unique():
+        sections.append(f"{table.replace('_', ' ').title()}:\n{result_table(results, model, table, run_id).to_string()}")
+    return "\n\n".join(sections) + "\n"
+
+
+def export_latest_run(results, run_id, path=FRONTEND_RESULTS_PATH):
+    """Write one run's tables as {stage: {model: {table: records}}} for the frontend"""
+    run = results[results['run_id'] == run_id]
+    export = {'run_id': run_id}
+    for (stage, model), rows in run.groupby(['stage', 'model'], sort=False):
+        tables = {}
+        for table in rows['table'].unique():
+            wide = result_table(rows, model, table, run_id)
+            records = wide.rename_axis('row').reset_index()
+            tables[table] = frame_records(records)
+        export.setdefault(stage, {})[model] = tables
+
+    write_json(path, export)
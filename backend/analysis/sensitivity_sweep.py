@@ -0,0 +1,316 @@
+import pandas as pd
+import numpy as np
+import itertools
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from advanced_analytics import (prepare_features, regression_subset, build_ml_matrix, make_classifiers,
+                                TEST_SIZE, RANDOM_STATE, N_ESTIMATORS, DATA_PATHS as MODEL_DATA_PATHS)
+from position_analysis import position_summary, SUMMARY_MIN_PLAYERS, DATA_PATHS as POSITION_DATA_PATHS
+from measurement_correlation import correlation_matrix, MIN_NON_NULL_FRACTION, DATA_PATHS as CORRELATION_DATA_PATHS
+from chart_data import MIN_PLAYERS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import load_dataset, PRO_BOWL_THRESHOLD
+from common.artifacts import write_json
+
+# Values tried for each choice; every list includes the analysis default (the
+# setting the stages publish with)
+MODEL_GRID = {
+    'test_size': [0.2, TEST_SIZE, 0.33],
+    'n_estimators': [50, N_ESTIMATORS, 200],
+    'threshold': [0, PRO_BOWL_THRESHOLD, 2],
+}
+POSITION_GRID = {
+    'min_players': [SUMMARY_MIN_PLAYERS, 2, MIN_PLAYERS, 5, 10],
+    'threshold': MODEL_GRID['threshold'],
+}
+CORRELATION_GRID = {
+    'min_fraction': [0.05, MIN_NON_NULL_FRACTION, 0.25, 0.5],
+    'threshold': MODEL_GRID['threshold'],
+}
+
+# Seeds (for the split and both models) are added in rungs; after each rung,
+# configurations that are clearly dominated stop and only the rest get more seeds
+SEED_RUNGS = [[RANDOM_STATE, 0], [1, 2], [3, 4, 5, 6]]
+
+# A configuration is dominated when its mean random forest lift over the
+# majority-class baseline, plus this many standard errors, is still below the
+# best configuration's mean lift minus as many standard errors
+DOMINANCE_Z = 2.0
+
+MODEL_METRICS = ['lr_accuracy', 'rf_accuracy', 'baseline_accuracy', 'lr_lift', 'rf_lift',
+                 'ras_importance_rank', 'positive_rate']
+
+SWEEP_DIR = '../../backend/analysis/sensitivity'
+CUBE_PATH = os.path.join(SWEEP_DIR, 'model_cube.npz')
+SUMMARY_PATH = os.path.join(SWEEP_DIR, 'sensitivity_summary.json')
+
+
+def model_configs(grid=MODEL_GRID):
+    """Every combination of the grid values, in cube (row-major) order"""
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+
+def fit_config(frame, feature_columns, config, seed):
+    """Split, fit both classifiers and score them for one configuration and seed"""
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    metrics = dict.fromkeys(MODEL_METRICS, np.nan)
+    X, y = build_ml_matrix(frame, feature_columns, config['threshold'])
+    metrics['positive_rate'] = y.mean()
+    if y.nunique() < 2:
+        # Nobody (or everybody) passes this threshold: nothing to classify
+        return metrics
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=config['test_size'], random_state=seed)
+    if y_train.nunique() < 2:
+        return metrics
+    log_reg, rf = make_classifiers(seed, config['n_estimators'])
+    log_reg.fit(X_train, y_train)
+    rf.fit(X_train, y_train)
+
+    test_rate = y_test.mean()
+    metrics['baseline_accuracy'] = max(test_rate, 1 - test_rate)
+    metrics['lr_accuracy'] = accuracy_score(y_test, log_reg.predict(X_test))
+    metrics['rf_accuracy'] = accuracy_score(y_test, rf.predict(X_test))
+    metrics['lr_lift'] = metrics['lr_accuracy'] - metrics['baseline_accuracy']
+    metrics['rf_lift'] = metrics['rf_accuracy'] - metrics['baseline_accuracy']
+    # 1 = the random forest's most important feature
+    order = np.argsort(-rf.feature_importances_)
+    metrics['ras_importance_rank'] = int(np.flatnonzero(np.array(feature_columns)[order] == 'RAS_numeric')[0]) + 1
+    return metrics
+
+
+def _fit_shared_config(task):
+    """Worker task: fit one (configuration, seed) on the frame attached by the pool initializer"""
+    from common.shared_arrays import worker_arrays
+
+    index, seed_index, seed, config, feature_columns = task
+    return index, seed_index, fit_config(worker_arrays()['frame'], feature_columns, config, seed)
+
+
+def dominated(lifts, alive, z=DOMINANCE_Z):
+    """Indices in alive whose lift is clearly below the best configuration's
+
+    lifts is a (configurations, seeds) array with NaN for seeds not run.
+    """
+    alive = np.array(sorted(alive))
+    values = lifts[alive]
+    counts = np.sum(~np.isnan(values), axis=1)
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        # Configurations with no scored seeds give all-NaN rows
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=1)
+        se = np.nanstd(values, axis=1, ddof=1) / np.sqrt(counts)
+    se = np.nan_to_num(se)
+    if np.all(np.isnan(means)):
+        return set()
+    best = np.nanargmax(means)
+    lower_best = means[best] - z * se[best]
+    # Configurations that can't be scored (NaN) stop too
+    stop = ~(means + z * se >= lower_best)
+    return set(alive[stop].tolist())
+
+
+def sweep_models(regression_df, max_workers=None, grid=MODEL_GRID, rungs=SEED_RUNGS):
+    """Fit every model configuration over the seed rungs on a process pool
+
+    Returns the (grid..., seeds, metrics) result cube and the rung each
+    configuration stopped after (-1 for configurations that ran every rung).
+    """
+    from common.shared_arrays import share_frame, release_arrays, init_frame_worker
+
+    configs = model_configs(grid)
+    seeds = [seed for rung in rungs for seed in rung]
+    feature_columns = list(build_ml_matrix(regression_df)[0].columns)
+    frame = regression_df[feature_columns + ['Pro_Bowls_numeric']]
+
+    results = np.full((len(configs), len(seeds), len(MODEL_METRICS)), np.nan)
+    stopped_after = np.full(len(configs), -1)
+    alive = set(range(len(configs)))
+
+    handles, spec = share_frame(frame)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_frame_worker, initargs=(spec,)) as pool:
+            first_seed = 0
+            for rung, rung_seeds in enumerate(rungs):
+                tasks = [(i, first_seed + j, seed, configs[i], feature_columns)
+                         for i in sorted(alive) for j, seed in enumerate(rung_seeds)]
+                start = time.perf_counter()
+                futures = [pool.submit(_fit_shared_config, task) for task in tasks]
+                for future in as_completed(futures):
+                    index, seed_index, metrics = future.result()
+                    results[index, seed_index] = [metrics[name] for name in MODEL_METRICS]
+                first_seed += len(rung_seeds)
+
+                stop = dominated(results[:, :, MODEL_METRICS.index('rf_lift')], alive) if rung < len(rungs) - 1 else set()
+                for index in stop:
+                    stopped_after[index] = rung
+                alive -= stop
+                print(f"Rung {rung + 1}: {len(tasks)} fits in {time.perf_counter() - start:.1f}s, "
+                      f"{len(stop)} configurations stopped, {len(alive)} continue")
+    finally:
+        release_arrays(handles)
+
+    shape = tuple(len(values) for values in grid.values())
+    return results.reshape(shape + (len(seeds), len(MODEL_METRICS))), stopped_after.reshape(shape), seeds
+
+
+def sweep_positions(df, grid=POSITION_GRID):
+    """Position conclusions for every min_players / threshold combination"""
+    rows = []
+    for config in model_configs(grid):
+        stats = position_summary(df, 'Position', config['min_players'], config['threshold'])
+        rows.append({
+            **config,
+            'positions': len(stats),
+            'top_ras_position': stats.loc[stats['AvgRAS'].idxmax(), 'Position'] if len(stats) else None,
+            'top_multi_pro_bowl_position': (stats.loc[stats['MultiProBowlRate'].idxmax(), 'Position']
+                                            if len(stats) else None),
+        })
+    return pd.DataFrame(rows)
+
+
+def sweep_correlations(df, grid=CORRELATION_GRID):
+    """Correlation conclusions for every non-null cutoff / threshold combination"""
+    rows = []
+    for config in model_configs(grid):
+        corr_df, _ = correlation_matrix(df, config['threshold'], config['min_fraction'])
+        row = {**config, 'columns': 0, 'ras_pro_bowl_correlation': None, 'top_measurement': None}
+        if corr_df is not None and 'pro_bowls_numeric' in corr_df.columns:
+            success = corr_df['pro_bowls_numeric'].drop(['pro_bowls_numeric', 'multiple_pro_bowls', 'ras_numeric'],
+                                                        errors='ignore').dropna()
+            row['columns'] = len(corr_df.columns)
+            row['ras_pro_bowl_correlation'] = corr_df.loc['ras_numeric', 'pro_bowls_numeric'] \
+                if 'ras_numeric' in corr_df.columns else None
+            row['top_measurement'] = success.abs().idxmax() if len(success) else None
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def agreement(values, default):
+    """Share of the sweep that reaches the same conclusion as the default settings"""
+    values = pd.Series(values).dropna()
+    return round(float((values == default).mean()), 3) if len(values) else None
+
+
+def summarize(cube, stopped_after, seeds, positions, correlations, grid=MODEL_GRID):
+    """How much each conclusion moves across the sweep, relative to the analysis defaults"""
+    metric = {name: cube[..., i] for i, name in enumerate(MODEL_METRICS)}
+    default = tuple(values.index(value) for values, value in
+                    zip(grid.values(), [TEST_SIZE, N_ESTIMATORS, PRO_BOWL_THRESHOLD]))
+    runs = ~np.isnan(metric['rf_accuracy'])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        marginals = {}
+        for axis, (name, values) in enumerate(grid.items()):
+            marginals[name] = {str(value): {
+                'rf_accuracy': float(np.nanmean(np.take(metric['rf_accuracy'], i, axis=axis))),
+                'rf_lift': float(np.nanmean(np.take(metric['rf_lift'], i, axis=axis))),
+                'lr_lift': float(np.nanmean(np.take(metric['lr_lift'], i, axis=axis))),
+            } for i, value in enumerate(values)}
+
+    default_positions = positions[(positions['min_players'] == SUMMARY_MIN_PLAYERS)
+                                  & (positions['threshold'] == PRO_BOWL_THRESHOLD)].iloc[0]
+    default_correlations = correlations[(correlations['min_fraction'] == MIN_NON_NULL_FRACTION)
+                                        & (correlations['threshold'] == PRO_BOWL_THRESHOLD)].iloc[0]
+    ras_correlations = correlations['ras_pro_bowl_correlation'].dropna().astype(float)
+
+    return {
+        'grid': {name: list(values) for name, values in grid.items()},
+        'seeds': seeds,
+        'fits': {'run': int(runs.sum()), 'possible': int(runs.size),
+                 'configurations_stopped_early': int((stopped_after >= 0).sum())},
+        'defaults': {
+            'rf_accuracy': float(np.nanmean(metric['rf_accuracy'][default])),
+            'lr_accuracy': float(np.nanmean(metric['lr_accuracy'][default])),
+            'baseline_accuracy': float(np.nanmean(metric['baseline_accuracy'][default])),
+        },
+        'conclusions': {
+            # Share of all (configuration, seed) fits
+            'rf_beats_baseline': float(np.mean(metric['rf_lift'][runs] > 0)),
+            'lr_beats_baseline': float(np.mean(metric['lr_lift'][runs] > 0)),
+            'rf_beats_lr': float(np.mean(metric['rf_accuracy'][runs] > metric['lr_accuracy'][runs])),
+            'ras_is_top_rf_feature': float(np.mean(metric['ras_importance_rank'][runs] == 1)),
+            'rf_accuracy_range': [float(np.nanmin(metric['rf_accuracy'])), float(np.nanmax(metric['rf_accuracy']))],
+            # Share of the position / correlation grids agreeing with the defaults
+            'top_ras_position': {'default': default_positions['top_ras_position'],
+                                 'agreement': agreement(positions['top_ras_position'],
+                                                        default_positions['top_ras_position'])},
+            'top_multi_pro_bowl_position': {'default': default_positions['top_multi_pro_bowl_position'],
+                                            'agreement': agreement(positions['top_multi_pro_bowl_position'],
+                                                                   default_positions['top_multi_pro_bowl_position'])},
+            'top_measurement': {'default': default_correlations['top_measurement'],
+                                'agreement': agreement(correlations['top_measurement'],
+                                                       default_correlations['top_measurement'])},
+            'ras_pro_bowl_correlation_sign': {
+                'default': float(np.sign(default_correlations['ras_pro_bowl_correlation'] or 0)),
+                'agreement': agreement(np.sign(ras_correlations),
+                                       np.sign(default_correlations['ras_pro_bowl_correlation'] or 0))},
+        },
+        'model_marginals': marginals,
+        'positions': positions.to_dict(orient='records'),
+        'correlations': correlations.to_dict(orient='records'),
+    }
+
+
+def save_cube(cube, stopped_after, seeds, path=CUBE_PATH, grid=MODEL_GRID):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, cube=cube, stopped_after=stopped_after, seeds=np.array(seeds),
+                        axes=np.array(list(grid) + ['seed', 'metric']), metrics=np.array(MODEL_METRICS),
+                        **{f"axis_{name}": np.array(values) for name, values in grid.items()})
+    print(f"Saved result cube {cube.shape} to {path}")
+
+
+def run_sweep(max_workers=None):
+    print("Running the sensitivity sweep...")
+
+    # Each section reads the same source as its stage (the loads come from the
+    # intermediate cache when a stage already ran)
+    frames = {}
+    for section, paths in [('models', MODEL_DATA_PATHS), ('positions', POSITION_DATA_PATHS),
+                           ('correlations', CORRELATION_DATA_PATHS)]:
+        frames[section], source = load_dataset(paths)
+        if frames[section] is None:
+            print(f"Error loading data for the {section} sweep")
+            return
+
+    start = time.perf_counter()
+    features, pos_col = prepare_features(frames['models'])
+    regression_df = regression_subset(features)
+    configs = model_configs()
+    print(f"Fitting {len(configs)} model configurations on up to "
+          f"{sum(len(rung) for rung in SEED_RUNGS)} seeds...")
+    cube, stopped_after, seeds = sweep_models(regression_df, max_workers)
+
+    # Same position set as the positions stage
+    positions = sweep_positions(frames['positions'][frames['positions']['Position'] != 'DB'])
+    correlations = sweep_correlations(frames['correlations'])
+    summary = summarize(cube, stopped_after, seeds, positions, correlations)
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+
+    save_cube(cube, stopped_after, seeds)
+    write_json(SUMMARY_PATH, summary, manifest=False, precision=4, indent=True)
+    print(f"Saved sensitivity summary to {SUMMARY_PATH}")
+
+    conclusions = summary['conclusions']
+    print(f"\nRandom forest beats the majority baseline in {conclusions['rf_beats_baseline']:.0%} of fits, "
+          f"RAS is its top feature in {conclusions['ras_is_top_rf_feature']:.0%}")
+    for name in ['top_ras_position', 'top_multi_pro_bowl_position', 'top_measurement', 'ras_pro_bowl_correlation_sign']:
+        # No agreement when the conclusion is undefined everywhere (e.g. no
+        # measurement columns in the correlation source)
+        agreement = conclusions[name]['agreement']
+        share = f"{agreement:.0%}" if agreement is not None else "n/a"
+        print(f"{name}: {conclusions[name]['default']} (same in {share} of settings)")
+    print(f"{summary['fits']['run']} of {summary['fits']['possible']} fits run in {summary['seconds']:.1f}s")
+    return summary
+
+
+if __name__ == "__main__":
+    run_sweep()
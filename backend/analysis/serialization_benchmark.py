@@ -0,0 +1,119 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import serialize
+
+BENCHMARK_PATH = '../../backend/analysis/serialization_benchmark.csv'
+
+ROW_COUNTS = [1000, 20000, 200000]
+
+# Columns in the synthetic correlation matrices
+MATRIX_SIZES = [20, 60, 200]
+
+
+def sample_players(n_rows, seed=0):
+    """Frame shaped like processed_data.json (text, floats with gaps, a few missing values)"""
+    rng = np.random.default_rng(seed)
+    positions = np.array(['QB', 'RB', 'WR', 'TE', 'OT', 'OG', 'OC', 'DE', 'DT', 'LB', 'CB', 'FS', 'SS'])
+    ras = np.round(rng.uniform(0, 10, n_rows), 2)
+    ras[rng.random(n_rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        'Player': [f"Player {i}" for i in range(n_rows)],
+        'Position': positions[rng.integers(0, len(positions), n_rows)],
+        'RAS_numeric': ras,
+        'Pro_Bowls_numeric': rng.poisson(1.5, n_rows).astype(float),
+        'College': np.where(rng.random(n_rows) < 0.05, None, 'State'),
+        'Draft': [f"{2000 + i % 24} Round {1 + i % 7} Pick {1 + i % 32}" for i in range(n_rows)],
+        'Profile_URL': [f"https://ras.football/player/{i}" for i in range(n_rows)]
+    })
+
+
+def _best_time(func, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def sample_correlations(n_columns, seed=0):
+    """Correlation matrix like measurement_correlation.json, with an undefined (NaN) column"""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(rng.normal(size=(500, n_columns)), columns=[f"measurement_{i}" for i in range(n_columns)])
+    data['constant'] = 1.0
+    return data.corr()
+
+
+def _old_nested_json(corr_df):
+    """The previous export: a dict built cell by cell, then json.dumps (which writes NaN literals)"""
+    corr_dict = {}
+    for i, col1 in enumerate(corr_df.columns):
+        corr_dict[col1] = {}
+        for j, col2 in enumerate(corr_df.columns):
+            corr_dict[col1][col2] = corr_df.iloc[i, j]
+    return json.dumps(corr_dict)
+
+
+def _record_row(method, size, seconds, baseline):
+    print(f"{size:>8}  {method:>24}: {seconds * 1000:9.1f} ms  ({baseline / seconds:.2f}x)")
+    return {
+        'measured_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'payload_size': size,
+        'method': method,
+        'seconds': round(seconds, 5),
+        'speedup_vs_current': round(baseline / seconds, 2)
+    }
+
+
+def run_benchmark(row_counts=ROW_COUNTS, matrix_sizes=MATRIX_SIZES):
+    """Time the previous export code against the serialize module and check the outputs agree"""
+    rows = []
+
+    print("Record exports (processed_data.json, ml_predictions.json):")
+    for n_rows in row_counts:
+        df = sample_players(n_rows)
+        if json.loads(serialize.dumps_frame(df)) != json.loads(df.to_json(orient='records')):
+            print(f"Warning: serialized output differs from to_json for {n_rows} rows")
+        baseline = _best_time(lambda: df.to_json(orient='records'))
+        rows.append(_record_row('to_json', n_rows, baseline, baseline))
+        rows.append(_record_row('dumps_frame', n_rows, _best_time(lambda: serialize.dumps_frame(df)), baseline))
+        rows.append(_record_row('streamed', n_rows,
+                                _best_time(lambda: b''.join(serialize.iter_records_json(df))), baseline))
+        # Per-row dicts encoded by orjson, the alternative dumps_frame does not use
+        rows.append(_record_row('frame_records+dumps', n_rows,
+                                _best_time(lambda: serialize.dumps(serialize.frame_records(df))), baseline))
+
+    print("Nested exports (measurement_correlation.json):")
+    encoder = serialize.orjson
+    for n_columns in matrix_sizes:
+        corr_df = sample_correlations(n_columns)
+        old = json.loads(_old_nested_json(corr_df).replace('NaN', 'null'))
+        if old != json.loads(serialize.dumps(serialize.frame_nested(corr_df, precision=None))):
+            print(f"Warning: nested output differs for a {n_columns}-column matrix")
+        baseline = _best_time(lambda: _old_nested_json(corr_df))
+        rows.append(_record_row('iloc+json.dumps', n_columns, baseline, baseline))
+        rows.append(_record_row('frame_nested+dumps', n_columns,
+                                _best_time(lambda: serialize.dumps(serialize.frame_nested(corr_df))), baseline))
+        # Same code path with the standard-library encoder
+        serialize.orjson = None
+        try:
+            rows.append(_record_row('frame_nested+json', n_columns,
+                                    _best_time(lambda: serialize.dumps(serialize.frame_nested(corr_df))), baseline))
+        finally:
+            serialize.orjson = encoder
+
+    results = pd.DataFrame(rows)
+    results.to_csv(BENCHMARK_PATH, mode='a', header=not os.path.exists(BENCHMARK_PATH), index=False)
+    print(f"Appended serialization benchmark to {BENCHMARK_PATH}")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,206 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from common.draft import draft_features
+from common.schema import file_hash
+from common.serialize import dumps, dumps_frame, iter_records_json, DOUBLE_PRECISION, STREAM_MIN_ROWS
+
+# Every file the frontend fetches lives here; manifest.json maps each of them
+# to its content hash so the app can request /data/<file>?v=<hash> and let the
+# browser keep cached copies of anything that has not changed.
+FRONTEND_DATA_DIR = '../../frontend/public/data'
+MANIFEST_NAME = 'manifest.json'
+
+# Per-directory record of the data each figure was last rendered from
+RENDER_CACHE_NAME = '.render_cache.json'
+
+PROCESSED_DATA_PATH = os.path.join(FRONTEND_DATA_DIR, 'processed_data.json')
+PROCESSED_DATA_COLUMNS = ['Player', 'Position', 'RAS_numeric', 'Pro_Bowls_numeric', 'College', 'Draft', 'Profile_URL']
+
+# Parsed draft fields exported next to the raw Draft string (see common/draft.py)
+DRAFT_EXPORT_COLUMNS = {
+    'draft_year': 'Draft_Year',
+    'draft_round': 'Draft_Round',
+    'draft_overall': 'Draft_Overall',
+    'undrafted': 'Undrafted',
+    'draft_value_jimmy_johnson': 'Draft_Value_Jimmy_Johnson',
+    'draft_value_rich_hill': 'Draft_Value_Rich_Hill',
+}
+
+
+def _in_frontend_data(path):
+    return os.path.dirname(os.path.abspath(path)) == os.path.abspath(FRONTEND_DATA_DIR)
+
+
+def _write_temp(path, chunks, unchanged_hash=None):
+    """Write chunks to a temp file next to path and rename it into place
+
+    When the streamed content hashes to unchanged_hash the temp file is
+    discarded instead. Returns True when path was replaced.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+            changed = digest.hexdigest() != unchanged_hash
+            if changed:
+                f.flush()
+                os.fsync(f.fileno())
+        if not changed:
+            os.remove(tmp_path)
+            return False
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def write_chunks(path, chunks, manifest=True):
+    """Stream byte chunks (outputs too large to build in memory) to path through a temp file
+
+    The temp file is discarded when its hash matches the existing file.
+    Returns True when path was replaced.
+    """
+    existing = file_hash(path) if os.path.exists(path) else None
+    changed = _write_temp(path, chunks, existing)
+    if changed and manifest:
+        _refresh_manifest(path)
+    return changed
+
+
+def write_bytes(path, data, manifest=True):
+    """Atomically write data to path, skipping the write when the content is unchanged
+
+    The bytes go to a temporary file in the same directory which is renamed
+    over the target, so readers never see a partially written file. Returns
+    True when the file was (re)written.
+    """
+    if os.path.exists(path) and file_hash(path) == hashlib.sha256(data).hexdigest():
+        return False
+    _write_temp(path, [data])
+    if manifest:
+        _refresh_manifest(path)
+    return True
+
+
+def _refresh_manifest(path):
+    if _in_frontend_data(path) and os.path.basename(path) != MANIFEST_NAME:
+        update_manifest(os.path.dirname(path))
+
+
+def write_text(path, text, manifest=True):
+    return write_bytes(path, text.encode('utf-8'), manifest)
+
+
+def write_json(path, obj, manifest=True, precision=None, indent=False):
+    """Write nested dicts/lists as JSON (NaN as null) through write_bytes"""
+    return write_bytes(path, dumps(obj, precision, indent), manifest)
+
+
+def write_frame_json(path, df, orient='records', precision=DOUBLE_PRECISION, index=True, manifest=True):
+    """DataFrame.to_json replacement; large record exports are streamed in chunks"""
+    if orient == 'records' and len(df) > STREAM_MIN_ROWS:
+        return write_chunks(path, iter_records_json(df, precision), manifest)
+    return write_bytes(path, dumps_frame(df, orient, precision, index), manifest)
+
+
+def save_figure(path, fig=None, **kwargs):
+    """plt.savefig replacement: render to memory, write only if the image changed"""
+    import matplotlib.pyplot as plt
+
+    fig = fig or plt.gcf()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=os.path.splitext(path)[1].lstrip('.') or 'png', **kwargs)
+    return write_bytes(path, buffer.getvalue())
+
+
+def data_key(*parts):
+    """Content hash of the frames, arrays and plain values a figure is drawn from"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(part.columns) if isinstance(part, pd.DataFrame) else part.name).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def render_cached(path, key, draw, **kwargs):
+    """Call draw() and save the figure, unless path was already rendered from the same key
+
+    Returns True when the figure was rendered.
+    """
+    import matplotlib.pyplot as plt
+
+    cache_path = os.path.join(os.path.dirname(path), RENDER_CACHE_NAME)
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    name = os.path.basename(path)
+    if cache.get(name) == key and os.path.exists(path):
+        return False
+
+    draw()
+    save_figure(path, **kwargs)
+    plt.close()
+    cache[name] = key
+    write_json(cache_path, cache, indent=True)
+    return True
+
+
+def build_manifest(directory=FRONTEND_DATA_DIR):
+    """{file: {hash, bytes}} for every artifact in directory"""
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name == MANIFEST_NAME or name.startswith('.') or not os.path.isfile(path):
+            continue
+        files[name] = {'hash': file_hash(path)[:16], 'bytes': os.path.getsize(path)}
+    return {'files': files}
+
+
+def update_manifest(directory=FRONTEND_DATA_DIR):
+    """Rebuild the manifest from the files on disk (rewritten only when it changes)"""
+    if not os.path.isdir(directory):
+        return False
+    return write_json(os.path.join(directory, MANIFEST_NAME), build_manifest(directory), manifest=False, indent=True)
+
+
+def export_processed_data(df, path=PROCESSED_DATA_PATH):
+    """Write the player table the frontend lists (processed_data.json)"""
+    columns = [col for col in PROCESSED_DATA_COLUMNS if col in df.columns]
+    for col in PROCESSED_DATA_COLUMNS:
+        if col not in columns:
+            print(f"Warning: {col} column not found in data")
+    export_df = df[columns]
+    if 'Draft' in df.columns:
+        draft = draft_features(df['Draft'])[list(DRAFT_EXPORT_COLUMNS)].rename(columns=DRAFT_EXPORT_COLUMNS)
+        draft['Undrafted'] = draft['Undrafted'].map({1.0: True, 0.0: False})
+        # The models' placeholder round for undrafted players isn't a real round
+        draft.loc[draft['Undrafted'].eq(True), 'Draft_Round'] = np.nan
+        draft[['Draft_Value_Jimmy_Johnson', 'Draft_Value_Rich_Hill']] = draft[
+            ['Draft_Value_Jimmy_Johnson', 'Draft_Value_Rich_Hill']].round(1)
+        export_df = pd.concat([export_df, draft], axis=1)
+    changed = write_frame_json(path, export_df, orient='records')
+    print(f"{'Exported' if changed else 'Unchanged:'} {len(export_df)} records to {path}")
+    return changed
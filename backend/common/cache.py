@@ -0,0 +1,237 @@
+import pandas as pd
+import numpy as np
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+# Intermediate results shared by every stage and script. Entries are keyed by
+# the source of the function's module, its arguments' content and its
+# parameters, so editing the code or the input data never returns a stale
+# result.
+CACHE_DIR = '../../backend/.cache/frames'
+
+# The least recently used entries are evicted once the cache grows past this
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Set to disable the cache, e.g. when timing the uncached pipeline
+DISABLE_ENV = 'NFL_RAS_NO_CACHE'
+
+_source_hashes = {}
+
+
+def _update(digest, value):
+    """Feed a frame, array or plain value into digest by content"""
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(dtype) for dtype in value.dtypes])).encode())
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=True)
+        except TypeError:
+            # Unhashable cells (e.g. scraped dicts) are hashed by their text
+            hashed = pd.util.hash_pandas_object(value.astype(str), index=True)
+        digest.update(hashed.to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        _update(digest, value.to_frame(name=str(value.name)))
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            _update(digest, key)
+            _update(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def content_hash(*values):
+    digest = hashlib.sha256()
+    for value in values:
+        _update(digest, value)
+    return digest.hexdigest()
+
+
+def source_hash(module):
+    """Hash of a module's source code (its name when the source isn't available)"""
+    if module not in _source_hashes:
+        try:
+            source = inspect.getsource(module)
+        except (OSError, TypeError):
+            source = module.__name__
+        _source_hashes[module] = hashlib.sha256(source.encode()).hexdigest()
+    return _source_hashes[module]
+
+
+def _write_atomic(path, write):
+    """Call write(tmp_path) and rename the result into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _save_part(path_stem, value):
+    """Write one result value as Parquet (frames), .npy (arrays) or JSON; returns its part spec"""
+    if isinstance(value, pd.DataFrame):
+        _write_atomic(f"{path_stem}.parquet", lambda tmp: value.to_parquet(tmp))
+        return {'kind': 'frame', 'file': f"{os.path.basename(path_stem)}.parquet"}
+    if isinstance(value, pd.Series):
+        name = value.name
+        frame = value.to_frame(name='value')
+        _write_atomic(f"{path_stem}.parquet", lambda tmp: frame.to_parquet(tmp))
+        return {'kind': 'series', 'file': f"{os.path.basename(path_stem)}.parquet", 'name': name}
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        def save_array(tmp):
+            with open(tmp, 'wb') as f:
+                np.save(f, value)
+        _write_atomic(f"{path_stem}.npy", save_array)
+        return {'kind': 'array', 'file': f"{os.path.basename(path_stem)}.npy"}
+    # Plain values; raises TypeError for anything JSON can't hold
+    return {'kind': 'value', 'value': json.loads(json.dumps(value))}
+
+
+def _load_part(directory, part):
+    if part['kind'] == 'frame':
+        return pd.read_parquet(os.path.join(directory, part['file']))
+    if part['kind'] == 'series':
+        return pd.read_parquet(os.path.join(directory, part['file']))['value'].rename(part['name'])
+    if part['kind'] == 'array':
+        return np.load(os.path.join(directory, part['file']))
+    return part['value']
+
+
+def _entry_files(directory, key):
+    return [name for name in os.listdir(directory) if name.startswith(key)]
+
+
+def load_entry(key, directory=CACHE_DIR):
+    """Cached result for key, or None; a hit marks the entry as recently used"""
+    meta_path = os.path.join(directory, f"{key}.json")
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        parts = [_load_part(directory, part) for part in meta['parts']]
+    except (OSError, ValueError, KeyError):
+        return None
+    os.utime(meta_path)
+    return tuple(parts) if meta['tuple'] else parts[0]
+
+
+def save_entry(key, result, label, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Store a result (a value or a tuple of values); returns False when it can't be cached"""
+    os.makedirs(directory, exist_ok=True)
+    is_tuple = isinstance(result, tuple)
+    values = result if is_tuple else (result,)
+    try:
+        parts = [_save_part(os.path.join(directory, f"{key}.{i}"), value) for i, value in enumerate(values)]
+    except (TypeError, ValueError, ImportError) as e:
+        # e.g. mixed-type object columns Parquet can't store
+        print(f"Not caching {label}: {e}")
+        for name in _entry_files(directory, key):
+            os.remove(os.path.join(directory, name))
+        return False
+    meta = {'function': label, 'tuple': is_tuple, 'parts': parts}
+
+    def save_meta(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+    # The metadata file is written last: an entry without it is never read
+    _write_atomic(os.path.join(directory, f"{key}.json"), save_meta)
+    evict(directory, max_bytes)
+    return True
+
+
+def evict(directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Remove least recently used entries until the cache fits in max_bytes"""
+    entries = {}
+    for name in os.listdir(directory):
+        if name.startswith('.'):
+            continue
+        key = name.split('.')[0]
+        entry = entries.setdefault(key, {'bytes': 0, 'used': 0.0})
+        path = os.path.join(directory, name)
+        entry['bytes'] += os.path.getsize(path)
+        if name.endswith('.json'):
+            entry['used'] = os.path.getmtime(path)
+
+    total = sum(entry['bytes'] for entry in entries.values())
+    removed = 0
+    for key, entry in sorted(entries.items(), key=lambda item: item[1]['used']):
+        if total <= max_bytes:
+            break
+        for name in _entry_files(directory, key):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+        total -= entry['bytes']
+        removed += 1
+    return removed
+
+
+def cached(func=None, depends=()):
+    """Memoize a pipeline function on disk by code, argument contents and parameters
+
+    The key covers the source of the function's whole module, so editing a
+    helper it calls also invalidates its results; modules in other files the
+    function relies on are listed in depends. Results must be DataFrames,
+    Series, NumPy arrays, JSON-ready values, or tuples of those.
+    """
+    if func is None:
+        return functools.partial(cached, depends=depends)
+    # Named by file rather than __module__ so a script run directly (as
+    # __main__) shares entries with the same function imported elsewhere
+    label = f"{os.path.splitext(os.path.basename(inspect.getfile(func)))[0]}.{func.__qualname__}"
+    modules = [inspect.getmodule(func)] + list(depends)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if os.environ.get(DISABLE_ENV):
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = content_hash(label, [source_hash(module) for module in modules], dict(bound.arguments))[:32]
+
+        result = load_entry(key)
+        if result is not None:
+            wrapper.hits += 1
+            return result
+        wrapper.misses += 1
+        result = func(*args, **kwargs)
+        save_entry(key, result, label)
+        return result
+
+    wrapper.hits = 0
+    wrapper.misses = 0
+    return wrapper
+
+
+def cache_size(directory=CACHE_DIR):
+    """(entries, bytes) currently in the cache"""
+    if not os.path.isdir(directory):
+        return 0, 0
+    names = [name for name in os.listdir(directory) if not name.startswith('.')]
+    return (sum(name.endswith('.json') for name in names),
+            sum(os.path.getsize(os.path.join(directory, name)) for name in names))
+
+
+def clear_cache(directory=CACHE_DIR):
+    """Remove every cached entry; returns the number of files removed"""
+    if not os.path.isdir(directory):
+        return 0
+    names = os.listdir(directory)
+    for name in names:
+        os.remove(os.path.join(directory, name))
+    return len(names)
@@ -0,0 +1,148 @@
+import pandas as pd
+import numpy as np
+
+# Draft cells in the RAS tables look like "2015 Round 1 Pick 12", "2020 Round 3",
+# "2018", "UDFA" or "2019 Undrafted"; pro-football-reference style strings
+# ("1st round, 12th pick, 12th overall") and "2015 1.12" are understood too
+# Any four-digit year is taken as the draft year; implausible ones are left
+# for the data quality check (quality.DRAFT_YEAR_MIN/MAX) to reject
+_YEAR_PATTERN = r'\b(\d{4})\b'
+_ROUND_PATTERN = r'(?i)(?:\bround\s*#?(?P<a>\d{1,2})\b|\b(?P<b>\d{1,2})(?:st|nd|rd|th)\s*round\b|\brd?\.?\s*(?P<c>\d{1,2})\b)'
+_PICK_PATTERN = r'(?i)(?:\bpick\s*#?(?P<a>\d{1,3})\b|\b(?P<b>\d{1,3})(?:st|nd|rd|th)\s*pick\b|\bpk\.?\s*(?P<c>\d{1,3})\b)'
+_OVERALL_PATTERN = r'(?i)(?:\b(?P<a>\d{1,3})(?:st|nd|rd|th)?\s*overall\b|\boverall\s*#?(?P<b>\d{1,3})\b)'
+_DOTTED_PATTERN = r'(?:^|\s)(?P<round>\d{1,2})\.(?P<pick>\d{1,2})(?:\s|$)'
+_UNDRAFTED_PATTERN = r'(?i)\b(?:udfa|undrafted|free agent)\b'
+
+# Overall pick numbers are estimated from round and pick-in-round with this
+# many picks per round (compensatory picks and smaller historical leagues are
+# ignored, which only shifts mid/late-round estimates by a few picks)
+PICKS_PER_ROUND = 32
+
+# Round feature given to undrafted players: one past the last round
+UNDRAFTED_ROUND = 8
+
+# Approximate Jimmy Johnson trade chart (1990s, still the common reference):
+# published values at anchor picks, linearly interpolated in between
+_JIMMY_JOHNSON_PICKS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 16, 20, 24, 28, 32, 40, 48, 56, 64,
+                                 80, 96, 112, 128, 160, 192, 224], dtype=float)
+_JIMMY_JOHNSON_VALUES = np.array([3000, 2600, 2200, 1800, 1700, 1600, 1500, 1400, 1350, 1300, 1000, 850, 740,
+                                  660, 590, 500, 420, 340, 270, 190, 116, 76, 44, 27, 14.2, 2], dtype=float)
+
+# Rich Hill's chart, approximated by a fit of its published values
+# (1000 at the first pick): value = 1000 * exp(-a * (pick - 1) ** b)
+_RICH_HILL_A = 0.1203
+_RICH_HILL_B = 0.70
+
+VALUE_CHARTS = ['jimmy_johnson', 'rich_hill']
+
+# Chart behind the single draft_value feature the models use
+DEFAULT_CHART = 'rich_hill'
+
+# Columns draft_features adds for the models
+MODEL_FEATURES = ['draft_round', 'undrafted', 'draft_value']
+
+# Distinct draft strings seen so far -> parsed fields; cleared when it grows past MEMO_LIMIT
+_memo = {}
+MEMO_LIMIT = 100000
+
+_FIELDS = ['draft_year', 'draft_round', 'draft_pick', 'draft_overall', 'undrafted']
+
+
+def _first_group(extracted):
+    """First non-missing named group of an alternation regex, as floats"""
+    return extracted.astype(float).bfill(axis=1).iloc[:, 0]
+
+
+def _parse_unique(strings):
+    """Parse distinct draft strings with vectorized regexes; returns an (n, fields) float array"""
+    text = pd.Series(strings, dtype='string').str.strip()
+    year = text.str.extract(_YEAR_PATTERN)[0].astype(float)
+    # Drop the year so "2015 1.12" and round/pick digits aren't confused with it
+    rest = text.str.replace(_YEAR_PATTERN, ' ', regex=True)
+    rnd = _first_group(rest.str.extract(_ROUND_PATTERN))
+    pick = _first_group(rest.str.extract(_PICK_PATTERN))
+    overall = _first_group(rest.str.extract(_OVERALL_PATTERN))
+
+    dotted = rest.str.extract(_DOTTED_PATTERN).astype(float)
+    rnd = rnd.fillna(dotted['round'])
+    pick = pick.fillna(dotted['pick'])
+
+    # A pick past the round's first overall number is itself an overall pick
+    first_of_round = (rnd - 1) * PICKS_PER_ROUND
+    estimated = pd.Series(np.where(pick > first_of_round, pick, first_of_round + pick), index=text.index)
+    overall = overall.fillna(estimated.where(rnd.notna()))
+    # A pick without a round is an overall pick
+    overall = overall.fillna(pick.where(rnd.isna()))
+    rnd = rnd.fillna(np.ceil(overall / PICKS_PER_ROUND))
+
+    undrafted = text.str.contains(_UNDRAFTED_PATTERN, regex=True).fillna(False).astype(float)
+    unknown = year.isna() & rnd.isna() & overall.isna() & undrafted.eq(0)
+    undrafted[unknown] = np.nan
+    return np.column_stack([year, rnd, pick, overall, undrafted])
+
+
+def _parsed_uniques(values):
+    """Codes of values into their distinct strings and the parsed fields of those strings
+
+    The table has a trailing all-NaN row that missing values (code -1) select.
+    """
+    codes, uniques = pd.factorize(pd.Series(values).astype('string'))
+    uniques = [str(u) for u in uniques]
+    new = [u for u in uniques if u not in _memo]
+    if new:
+        if len(_memo) + len(new) > MEMO_LIMIT:
+            _memo.clear()
+        for string, row in zip(new, _parse_unique(new)):
+            _memo[string] = row
+    table = np.vstack([_memo[u] for u in uniques] + [np.full(len(_FIELDS), np.nan)])
+    return codes, pd.DataFrame(table, columns=_FIELDS)
+
+
+def parse_draft(values):
+    """Year, round, pick, overall pick and undrafted flag for every draft string
+
+    Draft strings repeat heavily (one per year/round/pick), so each distinct
+    string is parsed once, memoized across calls, and mapped back by code.
+    """
+    values = pd.Series(values)
+    codes, table = _parsed_uniques(values)
+    return pd.DataFrame(table.to_numpy()[codes], index=values.index, columns=_FIELDS)
+
+
+def chart_value(overall, chart=DEFAULT_CHART):
+    """Trade-chart value of overall pick numbers (NaN stays NaN)"""
+    overall = np.asarray(overall, dtype=float)
+    if chart == 'jimmy_johnson':
+        value = np.interp(overall, _JIMMY_JOHNSON_PICKS, _JIMMY_JOHNSON_VALUES)
+    elif chart == 'rich_hill':
+        value = 1000 * np.exp(-_RICH_HILL_A * np.maximum(overall - 1, 0) ** _RICH_HILL_B)
+    else:
+        raise ValueError(f"Unknown draft value chart: {chart}")
+    return np.where(np.isnan(overall), np.nan, value)
+
+
+def round_value(rounds, chart=DEFAULT_CHART):
+    """Average chart value of the picks in each round, for players with a round but no pick"""
+    rounds = np.asarray(rounds, dtype=float)
+    picks = (np.nan_to_num(rounds)[:, None] - 1) * PICKS_PER_ROUND + np.arange(1, PICKS_PER_ROUND + 1)
+    return np.where(np.isnan(rounds), np.nan, chart_value(picks, chart).mean(axis=1))
+
+
+def draft_features(values):
+    """Parsed draft fields plus draft-capital value under every chart
+
+    Undrafted players get round UNDRAFTED_ROUND and zero value; drafted
+    players whose pick is unknown get their round's average value.
+    draft_value is the DEFAULT_CHART column the models use. Like the parse,
+    the values are computed once per distinct string.
+    """
+    values = pd.Series(values)
+    codes, features = _parsed_uniques(values)
+    undrafted = features['undrafted'].eq(1).to_numpy()
+    for chart in VALUE_CHARTS:
+        value = chart_value(features['draft_overall'], chart)
+        value = np.where(np.isnan(value), round_value(features['draft_round'], chart), value)
+        features[f"draft_value_{chart}"] = np.where(undrafted, 0.0, value)
+    features['draft_value'] = features[f"draft_value_{DEFAULT_CHART}"]
+    features.loc[undrafted, 'draft_round'] = UNDRAFTED_ROUND
+    return pd.DataFrame(features.to_numpy()[codes], index=values.index, columns=features.columns)
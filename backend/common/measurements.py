@@ -0,0 +1,52 @@
+import pandas as pd
+import re
+
+# Combine measurements found in the scraped tables. Keys are canonical names,
+# values hold the accepted header aliases (compared after lowercasing and
+# stripping anything that isn't a letter or digit, so "40_Yard_Dash" matches
+# "40yarddash") and whether a lower value is the better result. The RAS engine
+# scores these and the data quality checks range-check them, so both match
+# headers the same way.
+MEASUREMENTS = {
+    'height': {'aliases': ['height', 'ht'], 'lower_is_better': False},
+    'weight': {'aliases': ['weight', 'wt'], 'lower_is_better': False},
+    'forty': {'aliases': ['40yarddash', '40yddash', '40yd', '40', 'forty', '40time'], 'lower_is_better': True},
+    'split_20': {'aliases': ['20yardsplit', '20ydsplit', '20split'], 'lower_is_better': True},
+    'split_10': {'aliases': ['10yardsplit', '10ydsplit', '10split'], 'lower_is_better': True},
+    'vertical': {'aliases': ['verticaljump', 'vertical', 'vert'], 'lower_is_better': False},
+    'broad': {'aliases': ['broadjump', 'broad'], 'lower_is_better': False},
+    'shuttle': {'aliases': ['20yardshuttle', '20ydshuttle', 'shortshuttle', 'shuttle', 'proagility'], 'lower_is_better': True},
+    'three_cone': {'aliases': ['3conedrill', '3cone', 'threecone'], 'lower_is_better': True},
+    'bench': {'aliases': ['benchpress', 'bench', 'benchreps'], 'lower_is_better': False},
+}
+
+MEASUREMENT_NAMES = list(MEASUREMENTS)
+
+
+def normalize_header(header):
+    return re.sub(r'[^a-z0-9]', '', str(header).lower())
+
+
+def resolve_measurement_columns(columns):
+    """Map canonical measurement names to the matching raw column headers"""
+    normalized = {normalize_header(col): col for col in columns}
+    resolved = {}
+    for name, spec in MEASUREMENTS.items():
+        for alias in spec['aliases']:
+            if alias in normalized:
+                resolved[name] = normalized[alias]
+                break
+    return resolved
+
+
+def parse_number(values):
+    """Floats from a column, pulling the number out of strings like '4.50 seconds' or '35.5 inches'"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    numbers = pd.to_numeric(values, errors='coerce')
+    # Only strings that aren't plain numbers go through the (slower) regex
+    text = values[numbers.isna() & values.notna()]
+    if len(text):
+        extracted = text.astype('string').str.extract(r'(\d+\.\d+|\d+)')[0]
+        numbers.loc[text.index] = pd.to_numeric(extracted, errors='coerce')
+    return numbers.astype(float)
@@ -0,0 +1,127 @@
+import pandas as pd
+import numpy as np
+import os
+from datetime import date
+
+from common.draft import parse_draft
+from common.measurements import resolve_measurement_columns, parse_number
+
+# Plausible value ranges, checked on every loaded row. Canonical numeric
+# columns are matched by name; the other rules are named after measurements
+# in common/measurements.py and matched by their header aliases there (the
+# same matching the RAS engine uses). Height and broad jump are recorded as
+# feet and inches and are left to the RAS engine's parser.
+RANGE_RULES = {
+    'RAS': {'columns': ['RAS_numeric'], 'min': 0.0, 'max': 10.0},
+    'Pro_Bowls': {'columns': ['Pro_Bowls_numeric'], 'min': 0, 'max': 25},
+    'forty': {'min': 4.2, 'max': 6.0},
+    'weight': {'min': 140.0, 'max': 420.0},
+    'vertical': {'min': 10.0, 'max': 50.0},
+    'shuttle': {'min': 3.6, 'max': 6.0},
+    'three_cone': {'min': 6.0, 'max': 9.5},
+    'bench': {'min': 0, 'max': 55},
+}
+
+# Columns whose missing values make a row unusable
+REQUIRED_COLUMNS = ['Player']
+
+# First NFL draft; a draft year after next year's draft is a scraping error
+DRAFT_YEAR_MIN = 1936
+DRAFT_YEAR_MAX = date.today().year + 1
+
+# Columns missing in more than this share of rows are flagged in the report
+NULL_RATE_WARNING = 0.5
+
+QUALITY_DIR = '../../backend/data/quality'
+
+
+def resolve_rule_columns(columns, rules=RANGE_RULES):
+    """Map each range rule to the frame column it checks"""
+    measurement_columns = resolve_measurement_columns(columns)
+    resolved = {}
+    for name, rule in rules.items():
+        if 'columns' in rule:
+            found = [col for col in rule['columns'] if col in columns]
+            if found:
+                resolved[name] = found[0]
+        elif name in measurement_columns:
+            resolved[name] = measurement_columns[name]
+    return resolved
+
+
+def check_quality(df, source='data', rules=RANGE_RULES):
+    """Run every check over the frame at once
+
+    Each check yields one boolean column; the stacked (rows, checks) matrix
+    gives the per-check counts and the rows to quarantine in one reduction.
+    Returns the report dict and the (rows, checks) boolean failure frame.
+    """
+    checks = {}
+    details = {}
+
+    for name, col in resolve_rule_columns(df.columns, rules).items():
+        rule = rules[name]
+        values = parse_number(df[col]).to_numpy(dtype=float)
+        # NaN compares False, so missing values are left to the null rates
+        checks[f"{name}_range"] = (values < rule['min']) | (values > rule['max'])
+        details[f"{name}_range"] = {'column': col, 'rule': f"between {rule['min']} and {rule['max']}"}
+
+    for col in REQUIRED_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            checks[f"{col}_missing"] = (values.isna() | values.astype('string').str.strip().eq('')).to_numpy(dtype=bool)
+            details[f"{col}_missing"] = {'column': col, 'rule': 'required'}
+
+    if 'Profile_URL' in df.columns:
+        urls = df['Profile_URL']
+        # The first row with a URL is kept, later copies are quarantined
+        checks['duplicate_profile_url'] = (urls.notna() & urls.duplicated()).to_numpy()
+        details['duplicate_profile_url'] = {'column': 'Profile_URL', 'rule': 'unique'}
+
+    if 'Draft' in df.columns:
+        years = parse_draft(df['Draft'])['draft_year'].to_numpy()
+        checks['draft_year'] = (years < DRAFT_YEAR_MIN) | (years > DRAFT_YEAR_MAX)
+        details['draft_year'] = {'column': 'Draft', 'rule': f"year between {DRAFT_YEAR_MIN} and {DRAFT_YEAR_MAX}"}
+
+    names = list(checks)
+    matrix = np.column_stack([checks[name] for name in names]) if names else np.zeros((len(df), 0), dtype=bool)
+    failed_counts = matrix.sum(axis=0)
+    bad_rows = matrix.any(axis=1)
+
+    null_rates = df.isna().mean()
+    report = {
+        'source': source,
+        'rows': len(df),
+        'passed': int(len(df) - bad_rows.sum()),
+        'quarantined': int(bad_rows.sum()),
+        'checks': {name: {**details[name], 'failed': int(count)} for name, count in zip(names, failed_counts)},
+        'null_rates': {str(col): round(float(rate), 4) for col, rate in null_rates.items()},
+        'high_null_columns': [str(col) for col, rate in null_rates.items() if rate > NULL_RATE_WARNING],
+    }
+    if 'Profile_URL' in df.columns:
+        report['duplicate_profile_urls'] = int(df['Profile_URL'].dropna().duplicated(keep=False).sum())
+    return report, pd.DataFrame(matrix, index=df.index, columns=names)
+
+
+def quarantine_rows(df, failures):
+    """The rows that failed any check, with a Quality_Issues column naming the checks"""
+    bad_rows = failures.any(axis=1).to_numpy()
+    bad = df.loc[bad_rows].copy()
+    names = np.array(failures.columns, dtype=object)
+    bad['Quality_Issues'] = ['; '.join(names[row]) for row in failures.to_numpy()[bad_rows]]
+    return bad
+
+
+def write_quality_report(report, quarantined, source_path, directory=QUALITY_DIR):
+    """Save <source>_report.json and (when rows failed) <source>_quarantine.csv"""
+    from common.artifacts import write_json, write_text
+
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    report_path = os.path.join(directory, f"{stem}_report.json")
+    write_json(report_path, report, manifest=False, indent=True)
+    quarantine_path = os.path.join(directory, f"{stem}_quarantine.csv")
+    if len(quarantined):
+        write_text(quarantine_path, quarantined.to_csv(index=False), manifest=False)
+    elif os.path.exists(quarantine_path):
+        os.remove(quarantine_path)
+    return report_path, quarantine_path
@@ -0,0 +1,247 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+
+from common import draft, measurements, quality
+from common.cache import cached
+from common.quality import check_quality, quarantine_rows, write_quality_report
+
+# Canonical column -> raw headers seen in the scraped ras.football tables and
+# the CSV/JSON files derived from them, in order of preference
+COLUMN_ALIASES = {
+    'Player': ['Player', 'Name', 'player_name'],
+    'Profile_URL': ['Profile_URL', 'profile_url'],
+    'Position': ['Position', 'Pos', 'position'],
+    'College': ['College', 'college'],
+    'Draft': ['Draft', 'Draft Year', 'Draft_Year', 'draft'],
+    'Pro_Bowls': ['Pro_Bowls', 'ProBowls', 'Pro Bowls', 'pro_bowls'],
+    'RAS': ['RAS', 'ras_score', 'ras'],
+}
+
+# Numeric versions of these canonical columns are added as <column>_numeric
+NUMERIC_COLUMNS = ['RAS', 'Pro_Bowls']
+
+# Players with more Pro Bowls than this count as multiple Pro Bowlers (the
+# classifiers' target and the success metric of the correlation/position stages)
+PRO_BOWL_THRESHOLD = 1
+
+# Columns that are always present on a normalized frame (filled when missing)
+TEXT_DEFAULTS = {'Player': 'Unknown', 'Position': 'Unknown'}
+
+DETAILED_DATA_PATH = '../../backend/data/pro_bowlers_ras_detailed.csv'
+BASIC_DATA_PATH = '../../backend/data/pro_bowlers_ras.csv'
+SCHEMA_CACHE_PATH = '../../backend/data/schema_cache.json'
+
+# Player cells scraped with a profile link are stored as a dict, which the CSV
+# round-trip turns into its repr: {'text': 'Aaron Rodgers', 'link': 'https://...'}
+# Names containing an apostrophe are repr'd with double quotes instead.
+_DICT_TEXT_PATTERN = r"""['"]text['"]\s*:\s*(?P<q>['"])(?P<text>.*?)(?P=q)\s*[,}]"""
+_DICT_LINK_PATTERN = r"""['"]link['"]\s*:\s*(?P<q>['"])(?P<link>.*?)(?P=q)\s*[,}]"""
+
+# Resolved mappings keyed by the aliases they were resolved with and the
+# source's header row, mirrored to SCHEMA_CACHE_PATH (by save_mapping_cache)
+# once new ones have been added. Editing COLUMN_ALIASES changes every key, so
+# mappings resolved with the old aliases are never reused.
+_ALIASES_HASH = hashlib.sha256(json.dumps(COLUMN_ALIASES, sort_keys=True).encode()).hexdigest()[:16]
+_mapping_cache = {}
+_mapping_cache_dirty = False
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_columns(columns):
+    """Map each canonical column to the first matching raw header"""
+    columns = list(columns)
+    mapping = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in columns:
+                mapping[canonical] = alias
+                break
+    return mapping
+
+
+def _load_cache():
+    if not _mapping_cache and os.path.exists(SCHEMA_CACHE_PATH):
+        try:
+            with open(SCHEMA_CACHE_PATH) as f:
+                # Entries resolved with other aliases are dropped
+                _mapping_cache.update({key: entry for key, entry in json.load(f).items()
+                                       if key.startswith(f"{_ALIASES_HASH}:")})
+        except (OSError, ValueError):
+            pass
+    return _mapping_cache
+
+
+def resolve_source(path, columns):
+    """Resolve (and cache by aliases and header row) the column mapping for a source file
+
+    The mapping depends only on the headers, so re-scraped files with the same
+    columns reuse it without reading the file again. New mappings are only
+    kept in memory; save_mapping_cache writes them out.
+    """
+    global _mapping_cache_dirty
+    cache = _load_cache()
+    key = f"{_ALIASES_HASH}:{json.dumps([str(col) for col in columns])}"
+    if key in cache:
+        return cache[key]['mapping']
+
+    mapping = resolve_columns(columns)
+    cache[key] = {'source': os.path.basename(path), 'columns': list(columns), 'mapping': mapping}
+    _mapping_cache_dirty = True
+    return mapping
+
+
+def save_mapping_cache():
+    """Write the resolved mappings to SCHEMA_CACHE_PATH if any were added"""
+    global _mapping_cache_dirty
+    if not _mapping_cache_dirty:
+        return
+    try:
+        os.makedirs(os.path.dirname(SCHEMA_CACHE_PATH), exist_ok=True)
+        with open(SCHEMA_CACHE_PATH, 'w') as f:
+            json.dump(_mapping_cache, f, indent=2)
+        _mapping_cache_dirty = False
+    except OSError as e:
+        print(f"Could not save schema cache: {e}")
+
+
+def split_player_links(values):
+    """Split player cells into (name, profile URL) Series in one vectorized pass
+
+    Handles plain names, scraped {'text', 'link'} dicts and the stringified
+    dicts those become after a CSV round-trip.
+    """
+    first = values.dropna()
+    if len(first) and isinstance(first.iloc[0], dict):
+        return values.str.get('text').fillna(values), values.str.get('link')
+
+    text = values.astype('string')
+    names = text.str.extract(_DICT_TEXT_PATTERN)['text']
+    links = text.str.extract(_DICT_LINK_PATTERN)['link']
+    names = names.fillna(text)
+    return names.astype(object).where(names.notna(), None), links.astype(object).where(links.notna(), None)
+
+
+def normalize_frame(df, mapping=None):
+    """Rename raw headers to canonical columns and add typed numeric columns
+
+    Unmapped columns (e.g. profile measurements) are kept unchanged.
+    """
+    if mapping is None:
+        mapping = resolve_columns(df.columns)
+
+    clean = df.rename(columns={raw: canonical for canonical, raw in mapping.items()})
+
+    if 'Player' in clean.columns:
+        names, links = split_player_links(clean['Player'])
+        clean['Player'] = names
+        if 'Profile_URL' in clean.columns:
+            clean['Profile_URL'] = clean['Profile_URL'].where(clean['Profile_URL'].notna(), links)
+        elif links.notna().any():
+            clean['Profile_URL'] = links
+
+    for canonical in NUMERIC_COLUMNS:
+        if canonical in clean.columns:
+            clean[f"{canonical}_numeric"] = pd.to_numeric(clean[canonical], errors='coerce').astype(float)
+        else:
+            clean[f"{canonical}_numeric"] = np.nan
+
+    for canonical, default in TEXT_DEFAULTS.items():
+        if canonical not in clean.columns:
+            clean[canonical] = default
+
+    return clean
+
+
+def frame_problems(df):
+    """What is missing or unparseable in a normalized frame"""
+    problems = []
+    for canonical in COLUMN_ALIASES:
+        if canonical not in df.columns:
+            problems.append(f"missing column {canonical}")
+
+    for canonical in NUMERIC_COLUMNS:
+        if canonical in df.columns:
+            raw = df[canonical]
+            unparsed = raw.notna() & raw.astype('string').str.strip().ne('') & df[f"{canonical}_numeric"].isna()
+            if unparsed.any():
+                problems.append(f"{int(unparsed.sum())} {canonical} values are not numeric")
+    return problems
+
+
+def validate_frame(df, source='data'):
+    """Check a normalized frame once at ingest and report what is missing or unparseable"""
+    problems = frame_problems(df)
+    for problem in problems:
+        print(f"Warning ({source}): {problem}")
+    return problems
+
+
+@cached(depends=[quality, measurements, draft])
+def load_source(path, content_hash, validate=True, quarantine=True):
+    """Read, normalize and quality-check one source file
+
+    Returns (clean frame, schema problems, quality report, quarantined rows);
+    the last three are empty/None without validate. Nothing is printed or
+    written here, so a cache hit loses nothing: load_dataset reports the
+    problems and saves the quality report (and any newly resolved column
+    mapping) on every load.
+    content_hash (the file's hash) is only there for the cache key: an
+    unchanged file is loaded from the cache without being parsed again.
+    """
+    if path.endswith('.json'):
+        df = pd.read_json(path)
+    else:
+        df = pd.read_csv(path)
+
+    mapping = resolve_source(path, df.columns)
+    clean = normalize_frame(df, mapping)
+    if not validate:
+        return clean, [], None, None
+
+    problems = frame_problems(clean)
+    report, failures = check_quality(clean, os.path.basename(path))
+    quarantined = quarantine_rows(clean, failures)
+    if quarantine and len(quarantined):
+        clean = clean.loc[~failures.any(axis=1)].reset_index(drop=True)
+    return clean, problems, report, quarantined
+
+
+def load_dataset(paths=(DETAILED_DATA_PATH, BASIC_DATA_PATH), validate=True, quarantine=True):
+    """Load the first readable source file as a normalized, validated frame
+
+    With validate, the data quality checks run over every row and their
+    report is saved under backend/data/quality; with quarantine, rows that
+    failed a check are written there instead of being returned.
+    Returns (frame, path) or (None, None) when no source could be read.
+    """
+    for path in paths:
+        try:
+            clean, problems, report, quarantined = load_source(path, file_hash(path), validate, quarantine)
+        except (FileNotFoundError, ValueError, pd.errors.EmptyDataError) as e:
+            print(f"Could not load {path}: {e}")
+            continue
+        save_mapping_cache()
+
+        if validate:
+            source = os.path.basename(path)
+            for problem in problems:
+                print(f"Warning ({source}): {problem}")
+            write_quality_report(report, quarantined, path)
+            if len(quarantined):
+                action = 'quarantined' if quarantine else 'kept'
+                print(f"Warning ({source}): {len(quarantined)} rows failed data quality checks ({action})")
+
+        print(f"Loaded data for {len(clean)} players from {path}")
+        return clean, path
+
+    return None, None
@@ -0,0 +1,124 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Nested dicts and arrays (correlation matrices, result tables) are encoded
+# with orjson when it is installed. Whole DataFrames go through pandas' C
+# encoder instead: assembling per-row dicts in Python for orjson benchmarks
+# slower than DataFrame.to_json (see analysis/serialization_benchmark.py).
+# Both paths write NaN/inf as null and round floats to the same precision.
+
+# Decimal places kept for floats; matches DataFrame.to_json's default so
+# existing exports keep their values
+DOUBLE_PRECISION = 10
+
+# The most DataFrame.to_json supports
+MAX_PRECISION = 15
+
+# Record exports with more rows than this are streamed in chunks
+STREAM_MIN_ROWS = 50000
+STREAM_CHUNK_ROWS = 20000
+
+
+def normalize(obj, precision=None):
+    """Plain-Python copy of obj with NaN/inf as None, NumPy values converted and floats rounded"""
+    if isinstance(obj, dict):
+        return {str(key): normalize(value, precision) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [normalize(value, precision) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return normalize(obj.tolist(), precision)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return column_values(obj, precision)
+    if isinstance(obj, (float, np.floating)):
+        if not math.isfinite(obj):
+            return None
+        return round(float(obj), precision) if precision is not None else float(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    return obj
+
+
+def _encode(obj, indent=False):
+    """JSON bytes for data that is already normalized (or that orjson handles natively)"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, separators=None if indent else (',', ':'),
+                      allow_nan=False).encode('utf-8')
+
+
+def dumps(obj, precision=None, indent=False):
+    """Serialize nested dicts/lists (NumPy values allowed) to JSON bytes; NaN becomes null"""
+    # orjson already writes NaN as null and encodes NumPy values itself
+    if precision is not None or orjson is None:
+        obj = normalize(obj, precision)
+    return _encode(obj, indent)
+
+
+def column_values(values, precision=DOUBLE_PRECISION):
+    """One column as a list of JSON-ready values (rounded floats, None for missing)"""
+    array = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if array.dtype.kind == 'f':
+        if precision is not None:
+            array = np.round(array, precision)
+        missing = ~np.isfinite(array)
+        if missing.any():
+            array = array.astype(object)
+            array[missing] = None
+        return array.tolist()
+    if array.dtype.kind in 'iub':
+        return array.tolist()
+    array = array.astype(object)
+    array[pd.isna(array)] = None
+    if pd.api.types.infer_dtype(array, skipna=True) in ('string', 'empty'):
+        return array.tolist()
+    return [normalize(value, precision) for value in array.tolist()]
+
+
+def frame_columns(df, precision=DOUBLE_PRECISION):
+    return [str(col) for col in df.columns], [column_values(df.iloc[:, i], precision) for i in range(df.shape[1])]
+
+
+def frame_records(df, precision=DOUBLE_PRECISION):
+    """List of {column: value} rows, as DataFrame.to_json(orient='records') produces"""
+    columns, values = frame_columns(df, precision)
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def frame_nested(df, orient='columns', precision=DOUBLE_PRECISION):
+    """{column: {row: value}} (orient='columns') or {row: {column: value}} (orient='index')"""
+    if orient == 'index':
+        df = df.T
+    labels = [str(label) for label in df.index]
+    columns, values = frame_columns(df, precision)
+    return {column: dict(zip(labels, column_data)) for column, column_data in zip(columns, values)}
+
+
+def dumps_frame(df, orient='records', precision=DOUBLE_PRECISION, index=True):
+    """DataFrame as JSON bytes (pandas' encoder; NaN/inf as null)"""
+    kwargs = {'index': index} if orient in ('split', 'table') else {}
+    double_precision = MAX_PRECISION if precision is None else min(precision, MAX_PRECISION)
+    return df.to_json(orient=orient, double_precision=double_precision, **kwargs).encode('utf-8')
+
+
+def iter_records_json(df, precision=DOUBLE_PRECISION, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield a records-orient JSON array in byte chunks, encoding chunk_rows rows at a time"""
+    yield b'['
+    for start in range(0, len(df), chunk_rows):
+        body = dumps_frame(df.iloc[start:start + chunk_rows], 'records', precision)[1:-1]
+        yield (b',' if start else b'') + body
+    yield b']'
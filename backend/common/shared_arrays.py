@@ -0,0 +1,114 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Views attached in a worker process, keyed by array name. Workers attach once
+# (in the pool initializer) and every task reads the same buffers.
+_attached = {}
+_handles = []
+
+
+def share_arrays(arrays):
+    """Copy NumPy arrays into shared memory blocks
+
+    Returns the SharedMemory handles (the caller owns them and must call
+    release_arrays when done) and a small picklable spec that workers pass to
+    attach_arrays to get zero-copy read-only views.
+    """
+    handles = []
+    spec = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        view[...] = array
+        handles.append(shm)
+        spec[name] = (shm.name, array.shape, array.dtype.str)
+    return handles, spec
+
+
+def attach_arrays(spec):
+    """Read-only views onto arrays published with share_arrays"""
+    views = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _handles.append(shm)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        views[name] = view
+    return views
+
+
+def init_worker(spec):
+    """ProcessPoolExecutor initializer: attach the shared arrays once per worker"""
+    _attached.update(attach_arrays(spec))
+
+
+def init_frame_worker(spec):
+    """ProcessPoolExecutor initializer: attach a shared frame once per worker"""
+    _attached['frame'] = attach_frame(spec)
+
+
+def init_frames_worker(specs):
+    """ProcessPoolExecutor initializer: attach several shared frames, keyed by name, once per worker"""
+    _attached.update({name: attach_frame(spec) for name, spec in specs.items()})
+
+
+def worker_arrays():
+    return _attached
+
+
+def release_arrays(handles):
+    for shm in handles:
+        shm.close()
+        shm.unlink()
+
+
+def share_frame(df):
+    """Publish a DataFrame's columns as shared NumPy buffers
+
+    Numeric and boolean columns are shared as-is; everything else is shared as
+    integer category codes, with the (small) category list carried in the spec.
+    The frame itself is never pickled.
+    """
+    import pandas as pd
+
+    arrays = {}
+    columns = []
+    for i, col in enumerate(df.columns):
+        key = f"col{i}"
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            arrays[key] = values.to_numpy()
+            columns.append((col, key, None))
+        else:
+            categorical = pd.Categorical(values.astype(object).where(values.notna(), None))
+            arrays[key] = categorical.codes
+            columns.append((col, key, list(categorical.categories)))
+
+    handles, array_spec = share_arrays(arrays)
+    return handles, {'arrays': array_spec, 'columns': columns}
+
+
+def attach_frame(spec):
+    """Rebuild a DataFrame over the shared buffers published by share_frame
+
+    Each column is its own block over its shared view (text columns stay
+    categorical over the shared codes), so attaching copies nothing;
+    building the frame from a dict would consolidate same-dtype columns into
+    a new (copied) block.
+    """
+    import pandas as pd
+
+    views = attach_arrays(spec['arrays'])
+    columns = {}
+    for col, key, categories in spec['columns']:
+        if categories is None:
+            columns[col] = pd.Series(views[key], copy=False)
+        else:
+            columns[col] = pd.Series(pd.Categorical.from_codes(views[key], categories=categories), copy=False)
+    frame = pd.concat(columns, axis=1, copy=False)
+
+    for col, key, categories in spec['columns']:
+        values = frame[col].to_numpy() if categories is None else frame[col].array.codes
+        assert np.shares_memory(values, views[key]), f"Column {col} was copied instead of attached"
+    return frame
@@ -0,0 +1,159 @@
+"""nfl-ras: single entry point for the scraper and analysis scripts
+
+    python backend/nfl_ras.py <command> [options]
+
+Only the standard library is imported up front. Each command imports its
+stage module (and that module only imports pandas, the figure stack or the
+ML stack when the command actually needs them).
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Command -> (script directory, module, function, help)
+COMMANDS = {
+    'collect': ('scrapers', 'collect_data', 'collect_pro_bowler_data', 'Scrape Pro Bowler RAS data'),
+    'convert': ('scrapers', 'convert_csv_to_json', 'convert_csv_to_json', 'Export the scraped CSV as processed_data.json'),
+    'analyze': ('scrapers', 'analyze_data', 'analyze_ras_data', 'Summary statistics and overview figures'),
+    'positions': ('analysis', 'position_analysis', 'analyze_positions', 'Position-specific statistics'),
+    'correlations': ('analysis', 'measurement_correlation', 'analyze_measurement_correlations',
+                     'Measurement vs Pro Bowl correlations'),
+    'models': ('analysis', 'advanced_analytics', 'perform_advanced_analysis', 'Regression and ML models'),
+    'comps': ('analysis', 'player_comps', 'build_player_comps', 'Similar-player index and per-player comps'),
+    'sweep': ('analysis', 'sensitivity_sweep', 'run_sweep',
+              'How stable the conclusions are across the analysis settings'),
+    'check': ('analysis', 'check_data', 'check_measurements_data', 'Inspect the detailed measurements file'),
+}
+
+# Libraries tracked by the startup benchmark
+HEAVY_MODULES = ['pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn', 'statsmodels', 'sklearn', 'requests', 'bs4']
+
+STARTUP_TIMES_PATH = os.path.join(BACKEND_DIR, 'analysis', 'startup_times.csv')
+
+
+def command_kwargs(args):
+    """Keyword arguments passed from the command line options to the stage function"""
+    if args.command in ('analyze', 'positions'):
+        return {'figures': not args.no_figures}
+    if args.command == 'models':
+        return {'text_summaries': args.text_summaries}
+    if args.command == 'sweep':
+        return {'max_workers': args.workers}
+    return {}
+
+
+def load_stage(command):
+    directory, module_name, function_name, _ = COMMANDS[command]
+    stage_dir = os.path.join(BACKEND_DIR, directory)
+    # Stages use paths relative to their own directory
+    os.chdir(stage_dir)
+    if stage_dir not in sys.path:
+        sys.path.insert(0, stage_dir)
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+
+def measure_startup(commands, repeats=3):
+    """Cold-start each command in a fresh interpreter and record the timings"""
+    rows = []
+    for command in commands:
+        timings = []
+        loaded = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), '--import-only', command],
+                                    capture_output=True, text=True, check=True)
+            timings.append(time.perf_counter() - start)
+            loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        rows.append({
+            'measured_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'command': command,
+            'best_seconds': round(min(timings), 4),
+            'median_seconds': round(sorted(timings)[len(timings) // 2], 4),
+            'heavy_modules': ' '.join(loaded)
+        })
+        print(f"{command:>12}: {min(timings) * 1000:7.1f} ms  loads: {', '.join(loaded) or '-'}")
+
+    write_header = not os.path.exists(STARTUP_TIMES_PATH)
+    with open(STARTUP_TIMES_PATH, 'a') as f:
+        if write_header:
+            f.write(','.join(rows[0]) + '\n')
+        for row in rows:
+            f.write(','.join(str(value) for value in row.values()) + '\n')
+    print(f"Appended startup times to {STARTUP_TIMES_PATH}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='nfl-ras', description='NFL RAS data collection and analysis')
+    parser.add_argument('--import-only', action='store_true', help=argparse.SUPPRESS)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, (_, _, _, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(command, help=help_text)
+        if command in ('analyze', 'positions'):
+            subparser.add_argument('--no-figures', action='store_true',
+                                   help='Skip PNG rendering (does not import matplotlib/seaborn)')
+        if command == 'models':
+            subparser.add_argument('--text-summaries', action='store_true',
+                                   help='Also render the recorded result tables as .txt summaries')
+        if command == 'sweep':
+            subparser.add_argument('--workers', type=int, default=None, help='Model-fitting processes')
+
+    run_all = subparsers.add_parser('all', help='Run analyze, positions, correlations and models concurrently')
+    run_all.add_argument('--sequential', action='store_true', help='Run the stages one after another instead')
+    run_all.add_argument('--compare', action='store_true', help='Also run sequentially and report the speedup')
+    run_all.add_argument('--workers', type=int, default=None, help='Stage processes (default: one per stage, up to the CPU count)')
+    run_all.add_argument('--no-figures', action='store_true', help='Skip PNG rendering')
+
+    cache = subparsers.add_parser('cache', help='Show the size of the intermediate results cache')
+    cache.add_argument('--clear', action='store_true', help='Remove every cached result')
+
+    startup = subparsers.add_parser('startup', help='Measure and record cold-start time for each command')
+    startup.add_argument('commands', nargs='*', metavar='command', help='Commands to measure (default: all)')
+    startup.add_argument('--repeats', type=int, default=3)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'startup':
+        unknown = [command for command in args.commands if command not in COMMANDS]
+        if unknown:
+            print(f"Unknown commands: {', '.join(unknown)}")
+            sys.exit(2)
+        measure_startup(args.commands or list(COMMANDS), args.repeats)
+        return
+
+    if args.command == 'cache':
+        # The cache directory is relative to the stage directories
+        os.chdir(os.path.join(BACKEND_DIR, 'analysis'))
+        from common.cache import cache_size, clear_cache, CACHE_DIR, MAX_CACHE_BYTES
+        entries, size = cache_size()
+        print(f"{entries} cached results, {size / 2 ** 20:.1f} of {MAX_CACHE_BYTES / 2 ** 20:.0f} MB in {CACHE_DIR}")
+        if args.clear:
+            print(f"Removed {clear_cache()} files")
+        return
+
+    if args.command == 'all':
+        from stage_runner import run_stages
+        run_stages(parallel=not args.sequential, compare=args.compare, figures=not args.no_figures,
+                   max_workers=args.workers)
+        return
+
+    stage = load_stage(args.command)
+    if args.import_only:
+        print(json.dumps([name for name in HEAVY_MODULES if name in sys.modules]))
+        return
+    stage(**command_kwargs(args))
+
+
+if __name__ == "__main__":
+    main()
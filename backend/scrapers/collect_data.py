@@ -1,9 +1,14 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import re
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.schema import resolve_columns
+from common.artifacts import write_frame_json, write_json
+from fetch_scheduler import FetchScheduler, fetch_url, FETCH_STATS_PATH, TIMEOUT
 
 # Make sure the data directory exists
 os.makedirs('../../backend/data', exist_ok=True)
@@ -17,7 +22,7 @@ def scrape_pro_bowler_ras():
     }
     
     print(f"Sending request to {url}...")
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, headers=headers, timeout=TIMEOUT)
     
     print(f"Response status code: {response.status_code}")
     
@@ -109,10 +114,18 @@ def scrape_pro_bowler_ras():
     return df
 
 
-def get_detailed_ras_data(profile_url):
-    """Scrape detailed RAS data from a player's profile page"""
-    response = requests.get(profile_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+def get_detailed_ras_data(profile_url, session=None):
+    """Scrape detailed RAS data from a player's profile page (None if it can't be fetched)"""
+    result = fetch_url(session or requests.Session(), profile_url)
+    if result['status'] != 200:
+        print(f"Could not fetch {profile_url}: {result['error'] or result['status']}")
+        return None
+    return parse_profile_page(result['text'])
+
+
+def parse_profile_page(html):
+    """Player name, RAS score and measurements from a profile page's HTML"""
+    soup = BeautifulSoup(html, 'html.parser')
     
     # Extract detailed metrics
     player_data = {}
@@ -145,28 +158,43 @@ def get_detailed_ras_data(profile_url):
 # For each player in our dataset, fetch their detailed profile
 def enrich_pro_bowler_data(df):
     detailed_data = []
-    
-    for index, row in df.iterrows():
-        # Check if there's a link to follow - use 'Name' instead of 'Player'
-        if isinstance(row['Name'], dict) and 'link' in row['Name']:
-            profile_url = row['Name']['link']
-            print(f"Fetching data for {row['Name']['text']} ({index+1}/{len(df)})")
-            
-            # Avoid overwhelming the server
-            time.sleep(1)
+    columns = resolve_columns(df.columns)
+    
+    def column_value(row, canonical):
+        return row[columns[canonical]] if canonical in columns else None
+    
+    players = [column_value(row, 'Player') for _, row in df.iterrows()]
+    profile_urls = [player['link'] for player in players if isinstance(player, dict) and 'link' in player]
+    
+    # Fetch every profile page with adaptive concurrency; pages that still fail
+    # after the retries and re-queue passes are listed in the fetch stats
+    print(f"Fetching {len(profile_urls)} player profiles...")
+    scheduler = FetchScheduler()
+    pages = scheduler.fetch_all(profile_urls)
+    stats = scheduler.summary()
+    write_json(FETCH_STATS_PATH, stats, indent=True)
+    print(f"Fetched {stats['succeeded']} profiles, {stats['failed']} failed "
+          f"({stats['wall_seconds']}s, final concurrency {stats['final_concurrency']})")
+    print(f"Saved fetch statistics to {FETCH_STATS_PATH}")
+    
+    for (index, row), player in zip(df.iterrows(), players):
+        # Check if there's a link to follow
+        if isinstance(player, dict) and 'link' in player:
+            profile_url = player['link']
             
-            # Get detailed data
-            player_details = get_detailed_ras_data(profile_url)
+            # Get detailed data (basic data only when the page couldn't be fetched)
+            page = pages.get(profile_url)
+            player_details = parse_profile_page(page) if page is not None else {}
             
             # Combine with original row data
             combined_data = {
-                'Player': row['Name']['text'],
+                'Player': player['text'],
                 'Profile_URL': profile_url,
-                'Position': row['Pos'] if 'Pos' in row else None,
-                'Draft': row['Draft Year'] if 'Draft Year' in row else None,
-                'College': row['College'] if 'College' in row else None,
-                'Pro_Bowls': row['ProBowls'] if 'ProBowls' in row else None,
-                'RAS': row['RAS'] if 'RAS' in row else None
+                'Position': column_value(row, 'Position'),
+                'Draft': column_value(row, 'Draft'),
+                'College': column_value(row, 'College'),
+                'Pro_Bowls': column_value(row, 'Pro_Bowls'),
+                'RAS': column_value(row, 'RAS')
             }
             
             # Add the detailed measurements
@@ -178,7 +206,7 @@ def enrich_pro_bowler_data(df):
     
     return pd.DataFrame(detailed_data)
 
-if __name__ == "__main__":
+def collect_pro_bowler_data():
     print("Starting Pro Bowler RAS data collection...")
     
     # Run the scraper for basic data
@@ -198,9 +226,12 @@ if __name__ == "__main__":
         print(f"Saved detailed data for {len(enriched_df)} Pro Bowlers")
         
         # Save a JSON version for the frontend
-        enriched_df.to_json('../../backend/data/pro_bowlers_ras.json', orient='records')
+        write_frame_json('../../backend/data/pro_bowlers_ras.json', enriched_df, orient='records')
         print(f"Saved JSON data for frontend use")
         
         print("Data collection complete!")
     else:
-        print("Data collection failed.")
\ No newline at end of file
+        print("Data collection failed.")
+
+if __name__ == "__main__":
+    collect_pro_bowler_data()
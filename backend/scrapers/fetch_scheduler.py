@@ -0,0 +1,282 @@
+import requests
+import heapq
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# (connect, read) timeout for every request, in seconds
+TIMEOUT = (5, 20)
+
+# AIMD concurrency: +1 after INCREASE_AFTER fast successes in a row, halved on
+# throttling, server errors or timeouts
+MIN_CONCURRENCY = 1
+START_CONCURRENCY = 2
+MAX_CONCURRENCY = 8
+INCREASE_AFTER = 10
+
+# Responses slower than this (seconds) don't count towards raising concurrency
+LATENCY_TARGET = 2.0
+
+# Retries of one URL within a pass, with exponential backoff and jitter
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Circuit breaker: opens when at least BREAKER_MIN_RESULTS of the last
+# BREAKER_WINDOW results include a failure rate of BREAKER_FAILURE_RATE or more
+BREAKER_WINDOW = 20
+BREAKER_MIN_RESULTS = 10
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_COOLDOWN = 30.0
+# The run stops after the breaker trips this often; the URLs not fetched yet
+# are dropped (no re-queue pass) and listed under failed_urls in the stats
+MAX_BREAKER_TRIPS = 3
+
+# Extra passes over the URLs that failed, after a cool-down
+REQUEUE_PASSES = 1
+REQUEUE_DELAY = 30.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+FETCH_STATS_PATH = '../../backend/data/fetch_stats.json'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def retry_after_seconds(value, now=None):
+    """Seconds to wait from a Retry-After header (delta seconds or an HTTP date), None if unusable"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def fetch_url(session, url, timeout=TIMEOUT):
+    """GET one URL; never raises, returns a result dict for the scheduler"""
+    start = time.monotonic()
+    try:
+        response = session.get(url, timeout=timeout)
+        return {'status': response.status_code, 'text': response.text, 'error': None,
+                'retry_after': response.headers.get('Retry-After'), 'seconds': time.monotonic() - start}
+    except requests.Timeout as e:
+        return {'status': None, 'text': None, 'error': f"timeout: {e}", 'retry_after': None,
+                'seconds': time.monotonic() - start}
+    except requests.RequestException as e:
+        return {'status': None, 'text': None, 'error': f"{type(e).__name__}: {e}", 'retry_after': None,
+                'seconds': time.monotonic() - start}
+
+
+class FetchScheduler:
+    """Fetch many URLs with adaptive concurrency, backoff, a circuit breaker and re-queue passes
+
+    All scheduling state lives on the calling thread; worker threads only run
+    fetch_url.
+    """
+
+    def __init__(self, session=None, timeout=TIMEOUT, max_concurrency=MAX_CONCURRENCY, log=print):
+        self.session = session or requests.Session()
+        self.session.headers.update(HEADERS)
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.concurrency = min(START_CONCURRENCY, max_concurrency)
+        self.log = log
+
+        self.resume_at = 0.0
+        self.fast_streak = 0
+        self.recent = deque(maxlen=BREAKER_WINDOW)
+        self.breaker_state = 'closed'
+        # URLs that failed with a non-retryable status (404 etc.) aren't re-queued
+        self.permanent_failures = set()
+        self.stats = {
+            'requests': 0, 'succeeded': 0, 'failed': 0, 'retries': 0, 'requeued': 0,
+            'breaker_trips': 0, 'aborted': False, 'status_codes': Counter(), 'errors': Counter(),
+            'latencies': [], 'concurrency_changes': [], 'waited_seconds': 0.0, 'failed_urls': {}
+        }
+
+    # Concurrency control
+
+    def _set_concurrency(self, value, reason):
+        value = max(MIN_CONCURRENCY, min(self.max_concurrency, value))
+        if value != self.concurrency:
+            self.stats['concurrency_changes'].append({'at': round(time.monotonic() - self.started, 2),
+                                                     'from': self.concurrency, 'to': value, 'reason': reason})
+            self.concurrency = value
+
+    def _pause(self, seconds, reason):
+        now = time.monotonic()
+        if now + seconds > self.resume_at:
+            if now >= self.resume_at:
+                self.log(f"Pausing requests for {seconds:.1f}s ({reason})")
+            self.resume_at = now + seconds
+
+    def _record_success(self, seconds):
+        self.recent.append(True)
+        if self.breaker_state == 'half-open':
+            self.log("Circuit breaker closed")
+            self.breaker_state = 'closed'
+        self.fast_streak = self.fast_streak + 1 if seconds <= LATENCY_TARGET else 0
+        if self.fast_streak >= INCREASE_AFTER:
+            self.fast_streak = 0
+            self._set_concurrency(self.concurrency + 1, 'healthy')
+
+    def _record_failure(self, reason, retry_after=None):
+        self.recent.append(False)
+        self.fast_streak = 0
+        self._set_concurrency(self.concurrency // 2, reason)
+        if retry_after is not None:
+            self._pause(retry_after, f"Retry-After after {reason}")
+
+        failures = self.recent.count(False)
+        tripped = (self.breaker_state == 'half-open'
+                   or (len(self.recent) >= BREAKER_MIN_RESULTS and failures / len(self.recent) >= BREAKER_FAILURE_RATE))
+        if tripped:
+            self.stats['breaker_trips'] += 1
+            self.breaker_state = 'open'
+            self.recent.clear()
+            self.log(f"Circuit breaker opened ({failures} recent failures)")
+            self._pause(BREAKER_COOLDOWN, 'circuit breaker open')
+
+    # Running a pass
+
+    def _run_pass(self, urls):
+        """Fetch urls once (with retries); returns ({url: text}, [failed urls])"""
+        texts = {}
+        failed = []
+        # (ready time, sequence, url, attempt)
+        queue = [(0.0, i, url, 1) for i, url in enumerate(urls)]
+        heapq.heapify(queue)
+        sequence = len(queue)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while queue or in_flight:
+                if self.stats['breaker_trips'] >= MAX_BREAKER_TRIPS and not self.stats['aborted']:
+                    self.log("Circuit breaker tripped too often, stopping; the remaining URLs are dropped "
+                             "(listed in the fetch statistics)")
+                    self.stats['aborted'] = True
+                if self.stats['aborted']:
+                    for _, _, url, _ in queue:
+                        failed.append(url)
+                        self.stats['failed_urls'][url] = 'not fetched (circuit breaker)'
+                    queue = []
+                    if not in_flight:
+                        break
+
+                now = time.monotonic()
+                if self.breaker_state == 'open' and now >= self.resume_at:
+                    # Let a single probe request through
+                    self.breaker_state = 'half-open'
+                    self._set_concurrency(MIN_CONCURRENCY, 'circuit breaker half-open')
+
+                while (queue and len(in_flight) < self.concurrency and now >= self.resume_at
+                       and queue[0][0] <= now and self.breaker_state != 'open'):
+                    _, _, url, attempt = heapq.heappop(queue)
+                    future = pool.submit(fetch_url, self.session, url, self.timeout)
+                    in_flight[future] = (url, attempt)
+                    self.stats['requests'] += 1
+                    if self.breaker_state == 'half-open':
+                        break
+
+                if not in_flight:
+                    next_ready = max(self.resume_at, queue[0][0]) if queue else now
+                    delay = min(max(0.0, next_ready - now), 1.0)
+                    self.stats['waited_seconds'] += delay
+                    time.sleep(delay)
+                    continue
+
+                done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, attempt = in_flight.pop(future)
+                    result = future.result()
+                    status = result['status']
+                    self.stats['latencies'].append(result['seconds'])
+                    self.stats['status_codes'][str(status) if status else 'error'] += 1
+
+                    if status is not None and 200 <= status < 300:
+                        self._record_success(result['seconds'])
+                        texts[url] = result['text']
+                        continue
+
+                    reason = f"HTTP {status}" if status else result['error'].split(':')[0]
+                    retryable = status is None or status in RETRYABLE_STATUS
+                    if retryable:
+                        self._record_failure(reason, retry_after_seconds(result['retry_after']))
+                    else:
+                        # A 404 etc. says nothing about server health
+                        self.recent.append(True)
+                    self.stats['errors'][reason] += 1
+
+                    if retryable and attempt < MAX_ATTEMPTS:
+                        backoff = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                        heapq.heappush(queue, (time.monotonic() + backoff, sequence, url, attempt + 1))
+                        sequence += 1
+                        self.stats['retries'] += 1
+                    else:
+                        failed.append(url)
+                        self.stats['failed_urls'][url] = reason
+                        if not retryable:
+                            self.permanent_failures.add(url)
+        return texts, failed
+
+    def fetch_all(self, urls, requeue_passes=REQUEUE_PASSES, requeue_delay=REQUEUE_DELAY):
+        """Fetch every URL; failed ones get requeue_passes more passes. Returns {url: page text}"""
+        self.started = time.monotonic()
+        urls = list(dict.fromkeys(urls))
+        texts, failed = self._run_pass(urls)
+
+        for pass_number in range(requeue_passes):
+            requeue = [url for url in failed if url not in self.permanent_failures]
+            if not requeue or self.stats['aborted']:
+                break
+            self.log(f"Re-queueing {len(requeue)} failed URLs (pass {pass_number + 2}) after {requeue_delay:.0f}s")
+            self.stats['requeued'] += len(requeue)
+            time.sleep(requeue_delay)
+            self.stats['waited_seconds'] += requeue_delay
+            # Give the server a fresh start
+            self.recent.clear()
+            self.breaker_state = 'closed'
+            retried, still_failed = self._run_pass(requeue)
+            texts.update(retried)
+            failed = [url for url in failed if url in self.permanent_failures] + still_failed
+
+        self.stats['succeeded'] = len(texts)
+        self.stats['failed'] = len(failed)
+        self.stats['failed_urls'] = {url: self.stats['failed_urls'].get(url) for url in failed}
+        self.stats['wall_seconds'] = time.monotonic() - self.started
+        return texts
+
+    def summary(self):
+        """Per-run statistics as plain JSON-ready values"""
+        latencies = sorted(self.stats['latencies'])
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3) if latencies else None
+
+        stats = {key: value for key, value in self.stats.items() if key != 'latencies'}
+        stats.update({
+            'finished_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'status_codes': dict(self.stats['status_codes']),
+            'errors': dict(self.stats['errors']),
+            'latency_mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'latency_p50': percentile(0.5),
+            'latency_p95': percentile(0.95),
+            'final_concurrency': self.concurrency,
+            'waited_seconds': round(self.stats['waited_seconds'], 1),
+            'wall_seconds': round(self.stats.get('wall_seconds', 0.0), 2),
+            'pages_per_second': round(self.stats['succeeded'] / self.stats['wall_seconds'], 3)
+            if self.stats.get('wall_seconds') else None
+        })
+        return stats
@@ -0,0 +1,171 @@
+"""Run the independent analysis stages concurrently over shared datasets
+
+Every stage gets the same input it reads when run on its own (its
+DATA_PATHS). Each distinct source file is loaded once and published through
+shared memory (common.shared_arrays.share_frame); every worker process
+attaches to the same buffers instead of reloading the CSV or receiving a
+pickled DataFrame.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from nfl_ras import BACKEND_DIR, load_stage
+
+# Stages that only depend on the cleaned dataset
+STAGES = ['analyze', 'positions', 'correlations', 'models']
+
+REPORT_PATH = os.path.join(BACKEND_DIR, 'analysis', 'stage_run_report.json')
+
+
+def stage_kwargs(command, figures=True):
+    if command in ('analyze', 'positions'):
+        return {'figures': figures}
+    return {}
+
+
+def stage_paths(command):
+    """Source files a stage reads on its own, in order of preference"""
+    stage = load_stage(command)
+    return list(sys.modules[stage.__module__].DATA_PATHS)
+
+
+def load_stage_frames(stages):
+    """Load each distinct source the stages need once
+
+    Returns {source path: frame} and {stage: source path (None when none of
+    its files could be read)}.
+    """
+    from common.schema import load_dataset
+
+    frames = {}
+    sources = {}
+    loaded = {}
+    for command in stages:
+        paths = tuple(stage_paths(command))
+        if paths not in loaded:
+            df, source = load_dataset(paths)
+            loaded[paths] = source
+            # Different preference lists can resolve to the same file
+            if df is not None and source not in frames:
+                frames[source] = df
+        sources[command] = loaded[paths]
+    return frames, sources
+
+
+def run_stage(command, df, kwargs):
+    """Run one stage on df, capturing its output and any error"""
+    stage = load_stage(command)
+    log = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            stage(df=df, **kwargs)
+    except Exception:
+        error = traceback.format_exc()
+    return {'stage': command, 'seconds': time.perf_counter() - start, 'error': error, 'output': log.getvalue()}
+
+
+def _run_shared_stage(task):
+    """Worker task: run a stage on the frame attached by the pool initializer"""
+    from common.shared_arrays import worker_arrays
+
+    command, source, kwargs = task
+    # Shallow copy so columns a stage adds don't leak into the next stage run by this worker
+    df = worker_arrays()[source].copy(deep=False)
+    return run_stage(command, df, kwargs)
+
+
+def run_parallel(frames, sources, stages, figures=True, max_workers=None):
+    from common.shared_arrays import share_frame, release_arrays, init_frames_worker
+
+    handles = []
+    specs = {}
+    results = {}
+    try:
+        for source, df in frames.items():
+            source_handles, specs[source] = share_frame(df)
+            handles.extend(source_handles)
+        tasks = [(command, sources[command], stage_kwargs(command, figures)) for command in stages]
+        # More workers than cores only adds processes that each import the
+        # figure and model stacks, time-sliced on the same cores
+        workers = max_workers or min(len(stages), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_frames_worker,
+                                 initargs=(specs,)) as pool:
+            futures = [pool.submit(_run_shared_stage, task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['stage']] = result
+                print(f"  {result['stage']} finished in {result['seconds']:.2f}s"
+                      f"{' with errors' if result['error'] else ''}")
+    finally:
+        release_arrays(handles)
+    return [results[command] for command in stages]
+
+
+def run_sequential(frames, sources, stages, figures=True):
+    results = []
+    for command in stages:
+        result = run_stage(command, frames[sources[command]].copy(), stage_kwargs(command, figures))
+        results.append(result)
+        print(f"  {command} finished in {result['seconds']:.2f}s{' with errors' if result['error'] else ''}")
+    return results
+
+
+def run_stages(stages=STAGES, parallel=True, compare=False, figures=True, max_workers=None):
+    """Load each stage's source once and run the stages, optionally timing a sequential run too"""
+    # Headless rendering in the worker processes
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    frames, sources = load_stage_frames(stages)
+    # Stages use paths relative to their own directory (all at the same depth)
+    os.chdir(os.path.join(BACKEND_DIR, 'analysis'))
+
+    missing = [command for command in stages if sources[command] is None]
+    if missing:
+        print(f"No data files found for {', '.join(missing)}. Run the collect command first.")
+        stages = [command for command in stages if command not in missing]
+    if not stages:
+        return None
+
+    report = {'sources': {command: sources[command] for command in stages},
+              'players': {source: len(df) for source, df in frames.items()}, 'stages': list(stages)}
+
+    if parallel:
+        print(f"Running {len(stages)} stages in parallel...")
+        start = time.perf_counter()
+        results = run_parallel(frames, sources, stages, figures, max_workers)
+        report['parallel_seconds'] = time.perf_counter() - start
+    if compare or not parallel:
+        print(f"Running {len(stages)} stages sequentially...")
+        start = time.perf_counter()
+        sequential_results = run_sequential(frames, sources, stages, figures)
+        report['sequential_seconds'] = time.perf_counter() - start
+        if not parallel:
+            results = sequential_results
+
+    for result in results:
+        print(f"\n===== {result['stage']} ({result['seconds']:.2f}s) =====")
+        print(result['output'], end='')
+        if result['error']:
+            print(result['error'])
+
+    report['stage_seconds'] = {result['stage']: result['seconds'] for result in results}
+    report['errors'] = {result['stage']: result['error'] for result in results if result['error']}
+    if 'parallel_seconds' in report and 'sequential_seconds' in report:
+        report['speedup'] = report['sequential_seconds'] / report['parallel_seconds']
+        print(f"\nParallel: {report['parallel_seconds']:.2f}s, sequential: {report['sequential_seconds']:.2f}s, "
+              f"speedup: {report['speedup']:.2f}x")
+
+    # Stages running side by side each refresh the manifest; rebuild it once
+    # more now that every artifact is in place
+    from common.artifacts import update_manifest, write_json
+    update_manifest()
+
+    write_json(REPORT_PATH, report, manifest=False, indent=True)
+    print(f"Saved stage run report to {REPORT_PATH}")
+    return report
@@ -7,8 +7,37 @@ import {
   CartesianGrid,
   Tooltip,
   ResponsiveContainer,
+  ErrorBar,
 } from "recharts";
 
+// Pooled (group-shrunk) estimate with its band as [below, above] offsets for
+// ErrorBar; falls back to the raw value when the pooled fields are missing
+const withBand = (position, name) => {
+  const pooled = position[`Pooled${name}`];
+  if (pooled == null) {
+    return { value: position[name], band: [0, 0] };
+  }
+  return {
+    value: pooled,
+    band: [
+      pooled - position[`Pooled${name}_Lower`],
+      position[`Pooled${name}_Upper`] - pooled,
+    ],
+  };
+};
+
+// Label of what an estimate was pooled toward ("All" = every position)
+const pooledToward = (group) =>
+  group === "All" ? "all positions" : `the ${group} group`;
+
+const chartRows = (positions, name) =>
+  positions
+    .map((position) => {
+      const { value, band } = withBand(position, name);
+      return { Position: position.Position, value, band };
+    })
+    .sort((a, b) => b.value - a.value);
+
 const PositionInsights = ({ positionData }) => {
   const [selectedPosition, setSelectedPosition] = useState(null);
 
@@ -17,6 +46,11 @@ const PositionInsights = ({ positionData }) => {
     (a, b) => b.PlayerCount - a.PlayerCount,
   );
 
+  // Small-sample threshold and band level the estimates were computed with
+  // (the same on every row)
+  const { MinPlayers, CILevel } =
+    positionData.find((position) => position.MinPlayers != null) || {};
+
   return (
     <div>
       <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-2 mb-6">
@@ -31,10 +65,19 @@ const PositionInsights = ({ positionData }) => {
             onClick={() => setSelectedPosition(position)}
           >
             {position.Position} ({position.PlayerCount})
+            {position.SmallSample ? " *" : ""}
           </button>
         ))}
       </div>
 
+      {MinPlayers != null &&
+        positionData.some((position) => position.SmallSample) && (
+          <p className="text-sm text-gray-500 mb-4">
+            * fewer than {MinPlayers} players. Bars show estimates pooled
+            toward the position group, with {Math.round(CILevel * 100)}% bands.
+          </p>
+        )}
+
       {!selectedPosition ? (
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-6 mb-8">
           <div className="bg-white p-4 rounded shadow">
@@ -42,14 +85,14 @@ const PositionInsights = ({ positionData }) => {
               Average RAS by Position
             </h3>
             <ResponsiveContainer width="100%" height={300}>
-              <BarChart
-                data={sortedPositions.sort((a, b) => b.AvgRAS - a.AvgRAS)}
-              >
+              <BarChart data={chartRows(positionData, "AvgRAS")}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="Position" />
                 <YAxis domain={[0, 10]} />
                 <Tooltip formatter={(value) => value.toFixed(2)} />
-                <Bar dataKey="AvgRAS" fill="#8884d8" />
+                <Bar dataKey="value" name="AvgRAS" fill="#8884d8">
+                  <ErrorBar dataKey="band" width={4} stroke="#333" />
+                </Bar>
               </BarChart>
             </ResponsiveContainer>
           </div>
@@ -59,16 +102,14 @@ const PositionInsights = ({ positionData }) => {
               Multiple Pro Bowl Rate by Position
             </h3>
             <ResponsiveContainer width="100%" height={300}>
-              <BarChart
-                data={sortedPositions.sort(
-                  (a, b) => b.MultiProBowlRate - a.MultiProBowlRate,
-                )}
-              >
+              <BarChart data={chartRows(positionData, "MultiProBowlRate")}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="Position" />
                 <YAxis domain={[0, 100]} />
                 <Tooltip formatter={(value) => `${value.toFixed(1)}%`} />
-                <Bar dataKey="MultiProBowlRate" fill="#82ca9d" />
+                <Bar dataKey="value" name="MultiProBowlRate" fill="#82ca9d">
+                  <ErrorBar dataKey="band" width={4} stroke="#333" />
+                </Bar>
               </BarChart>
             </ResponsiveContainer>
           </div>
@@ -100,6 +141,27 @@ const PositionInsights = ({ positionData }) => {
             </div>
           </div>
 
+          {selectedPosition.PooledAvgRAS != null && (
+            <p className="mb-4 text-sm text-gray-700">
+              Pooled estimates: average RAS{" "}
+              {selectedPosition.PooledAvgRAS.toFixed(2)} (
+              {selectedPosition.PooledAvgRAS_Lower.toFixed(2)}–
+              {selectedPosition.PooledAvgRAS_Upper.toFixed(2)}, pooled toward{" "}
+              {pooledToward(selectedPosition.AvgRAS_Group)}), multiple Pro Bowl
+              rate {selectedPosition.PooledMultiProBowlRate.toFixed(1)}% (
+              {selectedPosition.PooledMultiProBowlRate_Lower.toFixed(1)}–
+              {selectedPosition.PooledMultiProBowlRate_Upper.toFixed(1)}%,
+              pooled toward{" "}
+              {pooledToward(selectedPosition.MultiProBowlRate_Group)})
+              {/* No slope when no position has more than 2 players */}
+              {selectedPosition.PooledRASSlope != null &&
+                `, Pro Bowls per RAS point ${selectedPosition.PooledRASSlope.toFixed(3)} (pooled toward ${pooledToward(selectedPosition.RASSlope_Group)})`}
+              .
+              {selectedPosition.SmallSample &&
+                " Small sample: these estimates lean mostly on the pooled group."}
+            </p>
+          )}
+
           <p className="mb-6">
             {selectedPosition.Position} players with high RAS scores are
             {selectedPosition.AvgRAS > 7
@@ -0,0 +1,21 @@
+// Files in public/data are listed in manifest.json with their content hash.
+// Requesting /data/<file>?v=<hash> gives every version of a file its own URL,
+// so the browser can keep cached copies until the backend actually changes them.
+let manifestPromise = null;
+
+const loadManifest = () => {
+  if (!manifestPromise) {
+    manifestPromise = fetch("/data/manifest.json", { cache: "no-cache" })
+      .then((response) => (response.ok ? response.json() : { files: {} }))
+      .catch(() => ({ files: {} }));
+  }
+  return manifestPromise;
+};
+
+export const dataUrl = async (name) => {
+  const manifest = await loadManifest();
+  const entry = manifest.files && manifest.files[name];
+  return entry ? `/data/${name}?v=${entry.hash}` : `/data/${name}`;
+};
+
+export const fetchData = async (name, options) => fetch(await dataUrl(name), options);
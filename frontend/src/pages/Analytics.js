@@ -9,6 +9,7 @@ import {
   Legend,
   ResponsiveContainer,
 } from "recharts";
+import { fetchData } from "../dataFiles";
 
 const Analytics = () => {
   const [predictions, setPredictions] = useState([]);
@@ -18,7 +19,7 @@ const Analytics = () => {
 
   useEffect(() => {
     // Load the ML predictions data
-    fetch("/data/ml_predictions.json")
+    fetchData("ml_predictions.json")
       .then((response) => response.json())
       .then((data) => {
         // Sort by RAS for proper line display
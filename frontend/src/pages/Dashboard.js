@@ -11,6 +11,7 @@ import {
 } from "recharts";
 import { BarChart, Bar } from "recharts";
 import PlayerTable from "../components/PlayerTable";
+import { fetchData } from "../dataFiles";
 
 const Dashboard = () => {
   const [playersData, setPlayersData] = useState([]);
@@ -22,7 +23,7 @@ const Dashboard = () => {
   useEffect(() => {
     // Load the processed data
     setLoading(true);
-    fetch("/data/processed_data.json")
+    fetchData("processed_data.json")
       .then((response) => {
         if (!response.ok) {
           throw new Error(`HTTP error! Status: ${response.status}`);
@@ -3,6 +3,7 @@ import { Tab, Tabs, TabList, TabPanel } from "react-tabs";
 import "react-tabs/style/react-tabs.css";
 import HeatmapChart from "../components/HeatmapChart";
 import PositionInsights from "../components/PositionInsights";
+import { fetchData } from "../dataFiles";
 
 const Insights = () => {
   const [correlationData, setCorrelationData] = useState(null);
@@ -21,9 +22,7 @@ const Insights = () => {
         let posData;
 
         try {
-          const corrResponse = await fetch(
-            "/data/measurement_correlation.json"
-          );
+          const corrResponse = await fetchData("measurement_correlation.json");
           if (corrResponse.ok) {
             corrData = await corrResponse.json();
           } else {
@@ -36,7 +35,7 @@ const Insights = () => {
         }
 
         try {
-          const posResponse = await fetch("/data/position_stats.json");
+          const posResponse = await fetchData("position_stats.json");
           if (posResponse.ok) {
             posData = await posResponse.json();
           } else {
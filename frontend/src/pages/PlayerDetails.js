@@ -1,14 +1,16 @@
 import React, { useState, useEffect } from "react";
 import { useParams, Link } from "react-router-dom";
+import { fetchData } from "../dataFiles";
 
 const PlayerDetails = () => {
   const { playerId } = useParams();
   const [player, setPlayer] = useState(null);
+  const [comps, setComps] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     // Load player data
-    fetch("/data/processed_data.json")
+    fetchData("processed_data.json")
       .then((response) => response.json())
       .then((data) => {
         const foundPlayer = data.find((p) => p.Player === playerId);
@@ -19,6 +21,12 @@ const PlayerDetails = () => {
         console.error("Error loading player data:", error);
         setLoading(false);
       });
+
+    // Precomputed similar players (backend/analysis/player_comps.py)
+    fetchData("player_comps.json")
+      .then((response) => (response.ok ? response.json() : { players: {} }))
+      .then((data) => setComps(data.players?.[playerId] || []))
+      .catch(() => setComps([]));
   }, [playerId]);
 
   if (loading) {
@@ -54,6 +62,16 @@ const PlayerDetails = () => {
             <p>
               <span className="font-medium">Draft:</span> {player.Draft}
             </p>
+            {player.Draft_Value_Jimmy_Johnson != null && (
+              <p>
+                <span className="font-medium">Draft Capital:</span>{" "}
+                {player.Draft_Overall != null
+                  ? `Pick ${player.Draft_Overall} overall, `
+                  : ""}
+                {player.Draft_Value_Jimmy_Johnson} (Jimmy Johnson) /{" "}
+                {player.Draft_Value_Rich_Hill} (Rich Hill)
+              </p>
+            )}
           </div>
           <div>
             <p>
@@ -80,6 +98,41 @@ const PlayerDetails = () => {
         </div>
       </div>
 
+      {comps.length > 0 && (
+        <div className="bg-white p-6 rounded shadow mb-6">
+          <h2 className="text-xl font-semibold mb-4">Similar Athletic Profiles</h2>
+          <table className="min-w-full text-left">
+            <thead>
+              <tr>
+                <th className="py-2">Player</th>
+                <th className="py-2">Position</th>
+                <th className="py-2">RAS</th>
+                <th className="py-2">Pro Bowls</th>
+                <th className="py-2">Distance</th>
+              </tr>
+            </thead>
+            <tbody>
+              {comps.map((comp) => (
+                <tr key={comp.Player} className="border-t">
+                  <td className="py-2">
+                    <Link
+                      to={`/player/${encodeURIComponent(comp.Player)}`}
+                      className="text-blue-600 hover:underline"
+                    >
+                      {comp.Player}
+                    </Link>
+                  </td>
+                  <td className="py-2">{comp.Position}</td>
+                  <td className="py-2">{comp.RAS?.toFixed(2) ?? "N/A"}</td>
+                  <td className="py-2">{comp.Pro_Bowls ?? "N/A"}</td>
+                  <td className="py-2">{comp.Distance.toFixed(2)}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
+
       <div className="text-center mt-6">
         <Link
           to="/"